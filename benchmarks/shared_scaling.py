@@ -0,0 +1,59 @@
+"""
+consume one source from 1..N threads through Iterable.shared()
+
+    python benchmarks/shared_scaling.py [items] [max threads]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from kataria import RangeIterable
+
+
+def work(v: int) -> int:
+    # small pure-python payload so the per-item cost isn't just the lock
+    acc = 0
+    for i in range(50):
+        acc += (v * i) % 7
+    return acc
+
+
+def run(items: int, threads: int, chunked: bool) -> float:
+    shared = RangeIterable(items).shared(chunk_size=256)
+
+    def drain(_):
+        it = shared.worker() if chunked else shared
+        return it.map(work).sum()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        total = sum(pool.map(drain, range(threads)))
+    elapsed = time.perf_counter() - start
+
+    assert total == sum(map(work, range(items)))
+    return elapsed
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    max_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+    print(f"python {sys.version.split()[0]}, gil {'enabled' if gil else 'disabled'}")
+    print(f"{'threads':>7} {'per item':>10} {'chunked':>10} {'speedup':>8}")
+
+    base = None
+    threads = 1
+    while threads <= max_threads:
+        per_item = run(items, threads, chunked=False)
+        chunked = run(items, threads, chunked=True)
+        base = base or chunked
+        print(
+            f"{threads:>7} {per_item:>9.3f}s {chunked:>9.3f}s {base / chunked:>7.2f}x"
+        )
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
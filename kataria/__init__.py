@@ -1,28 +1,72 @@
-from kataria.common import Panic, State
+from kataria.common import Memo, OptionMemo, Panic, ResultMemo, State
 from kataria.iterable import (
+    ArrayFromIterable,
+    Bitset,
+    BitsetFromIterable,
+    ColumnarFromIterable,
+    ColumnTable,
+    CountFromIterable,
+    FileRangeIterable,
+    FoldFromIterable,
     FromIterable,
+    InterningFromIterable,
     Iterable,
+    MappedFromIterable,
     MappingFromIterable,
+    MaxFromIterable,
+    MeanFromIterable,
+    MinFromIterable,
     NativeIterable,
     OptionSequenceIterable,
+    RangeIterable,
+    RestartableIterable,
     SequenceFromIterable,
+    SequenceIterable,
     SetFromIterable,
     StringFromIterable,
+    SumFromIterable,
+    VarianceFromIterable,
 )
-from kataria.option import Option
-from kataria.result import Result
+from kataria.option import LazyOption, Option
+from kataria.result import LazyResult, Result
+from kataria.sketch import BloomFilter, HyperLogLog
 
 __all__ = [
     "Option",
     "Result",
+    "LazyOption",
+    "LazyResult",
     "Panic",
     "State",
+    "Memo",
+    "OptionMemo",
+    "ResultMemo",
     "Iterable",
     "FromIterable",
     "MappingFromIterable",
     "SequenceFromIterable",
     "SetFromIterable",
     "StringFromIterable",
+    "MappedFromIterable",
+    "ColumnarFromIterable",
+    "ArrayFromIterable",
+    "Bitset",
+    "BitsetFromIterable",
+    "InterningFromIterable",
+    "ColumnTable",
+    "FoldFromIterable",
+    "CountFromIterable",
+    "SumFromIterable",
+    "MinFromIterable",
+    "MaxFromIterable",
+    "MeanFromIterable",
+    "VarianceFromIterable",
     "NativeIterable",
     "OptionSequenceIterable",
+    "RestartableIterable",
+    "SequenceIterable",
+    "RangeIterable",
+    "FileRangeIterable",
+    "BloomFilter",
+    "HyperLogLog",
 ]
@@ -1,4 +1,6 @@
-from typing import Callable, Generic, TypeVar
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
 
 
 class Panic(Exception):
@@ -9,6 +11,8 @@ StV = TypeVar("StV")
 
 
 class State(Generic[StV]):
+    __slots__ = ("val",)
+
     def __init__(self, val: StV):
         self.val = val
 
@@ -23,3 +27,84 @@ class State(Generic[StV]):
         old = self.get()
         self.val = v
         return old
+
+
+A = TypeVar("A")
+R = TypeVar("R")
+
+
+class Memo(Generic[A, R]):
+    def __init__(
+        self,
+        op: Callable[[A], R],
+        maxsize: "int | None" = 128,
+        ttl: "float | None" = None,
+        key: "Callable[[A], Hashable] | None" = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._op = op
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._key = key
+        self._clock = clock
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, arg: A) -> R:
+        k = arg if self._key is None else self._key(arg)
+
+        if (entry := self._cache.get(k)) is not None:
+            stored, expires = entry
+            if expires is None or self._clock() < expires:
+                self._cache.move_to_end(k)
+                self.hits += 1
+                return self._load(stored)
+            del self._cache[k]
+            self.evictions += 1
+
+        self.misses += 1
+        value = self._op(arg)
+        expires = None if self._ttl is None else self._clock() + self._ttl
+        self._cache[k] = (self._store(value), expires)
+        if self._maxsize is not None and len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+
+    def _store(self, value: R):
+        return value
+
+    def _load(self, stored) -> R:
+        return stored
+
+
+# options and results are mutable, so only their contents are cached and a
+# fresh wrapper is handed out on every hit
+
+
+class OptionMemo(Memo):
+    def _store(self, value):
+        return value._is_some, value._inner
+
+    def _load(self, stored):
+        from kataria.option import Option
+
+        return Option(*stored)
+
+
+class ResultMemo(Memo):
+    def _store(self, value):
+        return value._is_ok, value._value
+
+    def _load(self, stored):
+        from kataria.result import Result
+
+        return Result(*stored)
@@ -1,18 +1,39 @@
+import builtins
+import functools
+import hashlib
+import heapq
+import itertools
+import math
+import os
+import pickle
+import random
+import sys
+import tempfile
+import threading
+import types
 from abc import ABC
+from array import array
+from collections import deque
 from typing import (
     TYPE_CHECKING,
     Callable,
     Container,
     Generic,
+    Hashable,
+    Mapping,
     MutableMapping,
     MutableSequence,
     MutableSet,
+    Sequence,
     TypeVar,
 )
 
-from kataria.common import State
+from kataria.common import Memo, OptionMemo, State
+from kataria.sketch import BloomFilter, HyperLogLog
 
 if TYPE_CHECKING:
+    import typing
+
     from kataria.option import Option
     from kataria.result import Result
 
@@ -23,6 +44,7 @@ StV = TypeVar("StV")
 C = TypeVar("C", bound=Container)
 K = TypeVar("K")
 V = TypeVar("V")
+E = TypeVar("E")
 
 
 class FromIterable(Generic[C, T], ABC):
@@ -32,6 +54,10 @@ class FromIterable(Generic[C, T], ABC):
     def add(self, item: T):
         return NotImplemented
 
+    def extend(self, items: "typing.Iterable[T]"):
+        for item in items:
+            self.add(item)
+
     def finish(self) -> C:
         return self.collection
 
@@ -47,6 +73,9 @@ class SequenceFromIterable(FromIterable[MutableSequence[T], T]):
     def add(self, item: T):
         self.collection.append(item)
 
+    def extend(self, items: "typing.Iterable[T]"):
+        self.collection.extend(items)
+
 
 class StringFromIterable(FromIterable[str, str]):
     def __init__(self):
@@ -84,6 +113,450 @@ class SetFromIterable(FromIterable[MutableSet[T], T]):
     def add(self, item: T):
         self.collection.add(item)
 
+    def extend(self, items: "typing.Iterable[T]"):
+        self.collection.update(items)
+
+
+class ArrayFromIterable(FromIterable[array, T]):
+    def __init__(self, typecode: str):
+        super().__init__(array(typecode))
+
+    def add(self, item: T):
+        self.collection.append(item)
+
+    def extend(self, items: "typing.Iterable[T]"):
+        self.collection.extend(items)
+
+
+class Bitset:
+    def __init__(self):
+        self._bits = bytearray()
+
+    def add(self, i: int):
+        if i < 0:
+            raise ValueError("bitsets only hold non-negative integers")
+        byte = i >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(
+                bytes(max(byte + 1, 2 * len(self._bits)) - len(self._bits))
+            )
+        self._bits[byte] |= 1 << (i & 7)
+
+    def __contains__(self, i: int) -> bool:
+        byte = i >> 3
+        return 0 <= byte < len(self._bits) and bool(self._bits[byte] & (1 << (i & 7)))
+
+    def __len__(self) -> int:
+        return int.from_bytes(self._bits, "little").bit_count()
+
+    def __iter__(self) -> "typing.Iterator[int]":
+        for byte, bits in enumerate(self._bits):
+            while bits:
+                low = bits & -bits
+                yield (byte << 3) + low.bit_length() - 1
+                bits ^= low
+
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class BitsetFromIterable(FromIterable[Bitset, int]):
+    def __init__(self):
+        super().__init__(Bitset())
+
+    def add(self, item: int):
+        self.collection.add(item)
+
+
+class InterningFromIterable(FromIterable[C, T]):
+    # with local=False strings go through sys.intern, otherwise equal values
+    # are deduplicated through a table that's dropped after collecting
+
+    def __init__(self, into: "FromIterable[C, T] | None" = None, local: bool = True):
+        into = SequenceFromIterable() if into is None else into
+        super().__init__(into.collection)
+        self._into = into
+        self._table = {} if local else None
+
+    def _intern(self, item: T) -> T:
+        if self._table is not None:
+            return self._table.setdefault(item, item)
+        if isinstance(item, str):
+            return sys.intern(item)
+        return item
+
+    def add(self, item: T):
+        self._into.add(self._intern(item))
+
+    def extend(self, items: "typing.Iterable[T]"):
+        self._into.extend(map(self._intern, items))
+
+    def finish(self) -> C:
+        self._table = None
+        return self._into.finish()
+
+
+class ColumnTable:
+    def __init__(
+        self, columns: "dict[str, array | list]", dictionaries: "dict[str, list]"
+    ):
+        self._columns = columns
+        self._dictionaries = dictionaries
+
+    def __len__(self) -> int:
+        return len(next(iter(self._columns.values()), ()))
+
+    def names(self) -> "list[str]":
+        return list(self._columns)
+
+    def column(self, name: str) -> "NativeIterable":
+        values = self._columns[name]
+        if (dictionary := self._dictionaries.get(name)) is not None:
+            return NativeIterable(map(dictionary.__getitem__, values))
+        return NativeIterable(values)
+
+    def rows(self) -> "NativeIterable[tuple]":
+        return NativeIterable(
+            zip(*(self.column(name)._native() for name in self._columns))
+        )
+
+    def to_numpy(self, name: "str | None" = None):
+        import numpy
+
+        if name is None:
+            return {name: self.to_numpy(name) for name in self._columns}
+
+        values = self._columns[name]
+        if (dictionary := self._dictionaries.get(name)) is not None:
+            return numpy.asarray(dictionary, dtype=object)[
+                numpy.frombuffer(values, values.typecode)
+            ]
+        if isinstance(values, array):
+            return numpy.frombuffer(values, dtype=values.typecode)
+        return numpy.asarray(values, dtype=object)
+
+
+class ColumnarFromIterable(FromIterable[ColumnTable, "tuple | Mapping[str, T]"]):
+    # schema maps field names to an array typecode, None for plain python
+    # objects or "dict" for dictionary-encoded values
+
+    def __init__(self, schema: "Mapping[str, str | None]"):
+        columns = {}
+        dictionaries = {}
+        self._appenders = []
+        for name, kind in schema.items():
+            if kind is None:
+                columns[name] = []
+                self._appenders.append(columns[name].append)
+            elif kind == "dict":
+                columns[name] = array("I")
+                dictionaries[name] = []
+                self._appenders.append(
+                    self._encoder(columns[name].append, dictionaries[name])
+                )
+            else:
+                columns[name] = array(kind)
+                self._appenders.append(columns[name].append)
+
+        self._names = list(schema)
+        super().__init__(ColumnTable(columns, dictionaries))
+
+    @staticmethod
+    def _encoder(append: Callable[[int], None], dictionary: list):
+        codes = {}
+
+        def encode(value):
+            if (code := codes.get(value)) is None:
+                code = codes[value] = len(dictionary)
+                dictionary.append(value)
+            append(code)
+
+        return encode
+
+    def add(self, item: "tuple | Mapping[str, T]"):
+        if isinstance(item, Mapping):
+            item = [item[name] for name in self._names]
+        elif len(item) != len(self._names):
+            # checked up front, a partially appended row would misalign columns
+            raise ValueError(f"expected {len(self._names)} fields, got {len(item)}")
+        for append, value in zip(self._appenders, item):
+            append(value)
+
+
+class MappedFromIterable(FromIterable[C, T]):
+    def __init__(self, op: Callable[[T], U], into: FromIterable[C, U]):
+        super().__init__(into.collection)
+        self._op = op
+        self._into = into
+
+    def add(self, item: T):
+        self._into.add(self._op(item))
+
+    def finish(self) -> C:
+        return self._into.finish()
+
+
+class FoldFromIterable(FromIterable[U, T]):
+    def __init__(self, init: U, op: Callable[[U, T], U]):
+        super().__init__(init)
+        self._op = op
+
+    def add(self, item: T):
+        self.collection = self._op(self.collection, item)
+
+
+class CountFromIterable(FromIterable[int, T]):
+    def __init__(self):
+        super().__init__(0)
+
+    def add(self, item: T):
+        self.collection += 1
+
+
+class SumFromIterable(FromIterable[T, T]):
+    def __init__(self, start: T = 0):
+        super().__init__(start)
+
+    def add(self, item: T):
+        self.collection += item
+
+
+class MinFromIterable(FromIterable["Option[T]", T]):
+    def __init__(self):
+        super().__init__(None)
+        self._seen = False
+
+    def add(self, item: T):
+        if not self._seen or item < self.collection:
+            self.collection = item
+            self._seen = True
+
+    def finish(self) -> "Option[T]":
+        from kataria.option import Option
+
+        return Option(self._seen, self.collection)
+
+
+class MaxFromIterable(FromIterable["Option[T]", T]):
+    def __init__(self):
+        super().__init__(None)
+        self._seen = False
+
+    def add(self, item: T):
+        if not self._seen or item > self.collection:
+            self.collection = item
+            self._seen = True
+
+    def finish(self) -> "Option[T]":
+        from kataria.option import Option
+
+        return Option(self._seen, self.collection)
+
+
+class MeanFromIterable(FromIterable["Option[float]", float]):
+    def __init__(self):
+        super().__init__(None)
+        self._n = 0
+        self._mean = 0.0
+
+    def add(self, item: float):
+        self._n += 1
+        self._mean += (item - self._mean) / self._n
+
+    def finish(self) -> "Option[float]":
+        from kataria.option import Option
+
+        return Option(self._n > 0, self._mean)
+
+
+class VarianceFromIterable(FromIterable["Option[float]", float]):
+    # welford's online algorithm
+    def __init__(self, sample: bool = False):
+        super().__init__(None)
+        self._ddof = 1 if sample else 0
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, item: float):
+        self._n += 1
+        delta = item - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (item - self._mean)
+
+    def finish(self) -> "Option[float]":
+        from kataria.option import Option
+
+        n = self._n - self._ddof
+        return Option(n > 0, self._m2 / n if n > 0 else None)
+
+
+# used where sys.getsizeof can't tell, pypy raises TypeError without a default
+_SIZE_ESTIMATE = 64
+
+
+def _read_batches(f) -> "typing.Iterator":
+    while True:
+        try:
+            batch = pickle.load(f)
+        except EOFError:
+            return
+        yield from batch
+
+
+def _code_id(code) -> tuple:
+    consts = tuple(
+        _code_id(c) if hasattr(c, "co_code") else repr(c) for c in code.co_consts
+    )
+    return code.co_code, consts, code.co_names
+
+
+def _code_names(code) -> "set[str]":
+    names = set(code.co_names)
+    for c in code.co_consts:
+        if hasattr(c, "co_code"):
+            names |= _code_names(c)
+    return names
+
+
+def _describe_globals(op, seen: frozenset) -> "tuple | None":
+    # co_names mixes globals with attribute names, names that don't resolve
+    # are attributes. modules are described by the attributes used on them.
+    names = _code_names(op.__code__)
+    parts = []
+    for name in sorted(names):
+        if name in op.__globals__:
+            value = op.__globals__[name]
+        elif hasattr(builtins, name):
+            parts.append((name, "builtin"))
+            continue
+        else:
+            continue
+
+        if isinstance(value, types.ModuleType):
+            attrs = tuple(
+                (attr, _describe(getattr(value, attr), seen))
+                for attr in sorted(names)
+                if hasattr(value, attr)
+            )
+            if any(d is None for _, d in attrs):
+                return None
+            parts.append((name, value.__name__, attrs))
+        elif (described := _describe(value, seen)) is None:
+            return None
+        else:
+            parts.append((name, described))
+    return tuple(parts)
+
+
+def _describe(value, seen: frozenset) -> "Hashable | None":
+    # None means the value's state can't be described
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    if isinstance(value, (tuple, list, frozenset)):
+        values = sorted(value, key=repr) if isinstance(value, frozenset) else value
+        parts = tuple(_describe(v, seen) for v in values)
+        return None if None in parts else (type(value).__qualname__, parts)
+    if isinstance(value, dict):
+        parts = tuple(
+            (_describe(k, seen), _describe(v, seen)) for k, v in value.items()
+        )
+        return None if any(None in p for p in parts) else ("dict", parts)
+    if callable(value):
+        return _op_id(value, seen)
+    return None
+
+
+def _op_id(op, seen: frozenset = frozenset()) -> "Hashable | None":
+    if id(op) in seen:
+        # recursive reference, already being described further up
+        return "recursive"
+    seen = seen | {id(op)}
+
+    if isinstance(op, Memo):
+        return _op_id(op._op, seen)
+    if isinstance(op, functools.partial):
+        parts = (
+            _op_id(op.func, seen),
+            _describe(op.args, seen),
+            _describe(op.keywords, seen),
+        )
+        return None if None in parts else ("partial", parts)
+    if isinstance(op, types.MethodType):
+        parts = (_op_id(op.__func__, seen), _describe(op.__self__, seen))
+        return None if None in parts else ("method", parts)
+    if isinstance(op, type):
+        return op.__module__, op.__qualname__
+    if isinstance(
+        op,
+        (
+            types.BuiltinFunctionType,
+            types.MethodDescriptorType,
+            types.WrapperDescriptorType,
+        ),
+    ):
+        owner = getattr(op, "__self__", None)
+        if isinstance(owner, types.ModuleType):
+            owner = owner.__name__
+        elif isinstance(owner, type):
+            owner = owner.__module__, owner.__qualname__
+        elif (owner := _describe(owner, seen)) is None:
+            return None
+        return getattr(op, "__module__", None), op.__qualname__, owner
+    if not isinstance(op, types.FunctionType):
+        return None
+
+    try:
+        cells = tuple(c.cell_contents for c in op.__closure__ or ())
+    except ValueError:
+        # a cell that hasn't been assigned yet
+        return None
+    state = (
+        _describe(cells, seen),
+        _describe(op.__defaults__ or (), seen),
+        _describe(op.__kwdefaults__ or {}, seen),
+        _describe_globals(op, seen),
+    )
+    if None in state:
+        return None
+    return op.__module__, op.__qualname__, _code_id(op.__code__), state
+
+
+def _fingerprint(node) -> "list | None":
+    # describes a pipeline by its adapters, their ops and their source's
+    # identity. None means some part of it is opaque.
+    if isinstance(node, RestartableIterable):
+        return None if node._identity is None else [node._identity()]
+    if isinstance(node, FileRangeIterable):
+        return [node._identity()]
+    if isinstance(node, NativeIterable):
+        return None
+
+    parts = [type(node).__qualname__]
+    for attr, value in sorted(vars(node).items()):
+        if isinstance(value, Iterable):
+            values = [value]
+        elif isinstance(value, (deque, list, tuple)) and all(
+            isinstance(v, Iterable) for v in value
+        ):
+            values = list(value)
+        elif value is None or isinstance(value, (bool, int, float, str, bytes)):
+            parts.append((attr, value))
+            continue
+        elif callable(value):
+            if (op_id := _op_id(value)) is None:
+                return None
+            parts.append((attr, op_id))
+            continue
+        else:
+            return None
+
+        for v in values:
+            if (inner := _fingerprint(v)) is None:
+                return None
+            parts.append((attr, inner))
+    return parts
+
 
 class Iterable(Generic[T], ABC):
     Item = T
@@ -100,6 +573,37 @@ class Iterable(Generic[T], ABC):
             return item.unwrap()
         raise StopIteration
 
+    def _native(self) -> "typing.Iterator[Item]":
+        # plain python iterator over the remaining items, used by terminals
+        # that can hand the whole loop to a builtin. the iterator takes over,
+        # self shouldn't be advanced directly afterwards
+        return self
+
+    def split_len(self) -> int:
+        raise TypeError(f"{type(self).__name__} can't be split")
+
+    def split_at(self, i: int) -> "(Iterable[Item], Iterable[Item])":
+        raise TypeError(f"{type(self).__name__} can't be split")
+
+    def _one_to_one(self) -> bool:
+        # whether every split position yields exactly one item
+        return False
+
+    def split(self, n: int) -> "list[Iterable[Item]]":
+        if n < 1:
+            raise ValueError("split count has to be positive")
+
+        parts = []
+        rest = self
+        remaining = self.split_len()
+        for k in range(n, 1, -1):
+            size = remaining // k
+            part, rest = rest.split_at(size)
+            parts.append(part)
+            remaining -= size
+        parts.append(rest)
+        return parts
+
     def __getitem__(self, item: int) -> "Option[Item]":
         if item < 0:
             raise ValueError("iterators cannot be accessed in reverse")
@@ -145,12 +649,93 @@ class Iterable(Generic[T], ABC):
     def chain(self, other: "Iterable[Item]") -> "Chain[Item]":
         return Chain(self, other)
 
+    @staticmethod
+    def chain_all(iterables: "typing.Iterable[Iterable[T]]") -> "Chain[T]":
+        return Chain(*iterables)
+
+    def merge(
+        self,
+        others: "typing.Iterable[Iterable[Item]]",
+        key: "Callable[[Item], K] | None" = None,
+    ) -> "Merge[Item]":
+        return Merge((self, *others), key)
+
+    @staticmethod
+    def kmerge_by(
+        iterables: "typing.Iterable[Iterable[T]]",
+        key: "Callable[[T], K] | None" = None,
+    ) -> "Merge[T]":
+        return Merge(iterables, key)
+
+    def merge_join(
+        self,
+        other: "Iterable[U]",
+        key: Callable[[Item], K],
+        other_key: "Callable[[U], K] | None" = None,
+        how: str = "inner",
+    ) -> "MergeJoin":
+        return MergeJoin(self, other, key, other_key or key, how)
+
+    def join(
+        self,
+        other: "Iterable[U]",
+        left_key: Callable[[Item], K],
+        right_key: "Callable[[U], K] | None" = None,
+        how: str = "inner",
+        build: str = "right",
+        memory_limit: "int | None" = None,
+        tmpdir: "str | None" = None,
+    ) -> "HashJoin":
+        return HashJoin(
+            self,
+            other,
+            left_key,
+            right_key or left_key,
+            how,
+            build,
+            memory_limit,
+            tmpdir,
+        )
+
+    @staticmethod
+    def repeat(value: T, n: "int | None" = None) -> "Repeat[T]":
+        return Repeat(value, n)
+
+    @staticmethod
+    def successors(
+        first: "Option[T]", succ: Callable[[T], "Option[T]"]
+    ) -> "Successors[T]":
+        return Successors(first, succ)
+
+    @staticmethod
+    def from_fn(op: Callable[[], "Option[T]"]) -> "FromFn[T]":
+        return FromFn(op)
+
     def zip(self, other: "Iterable") -> "Zip[(T, U)]":
         return Zip(self, other)
 
     def map(self, op: Callable[[T], U]) -> "Map[U]":
         return Map(op, self)
 
+    def map_cached(
+        self,
+        op: "Callable[[T], U] | Memo[T, U]",
+        maxsize: "int | None" = 128,
+        ttl: "float | None" = None,
+        key: "Callable[[T], K] | None" = None,
+    ) -> "Map[U]":
+        if not isinstance(op, Memo):
+            op = Memo(op, maxsize, ttl, key)
+        return Map(op, self)
+
+    def map_catching(
+        self,
+        op: Callable[[T], U],
+        exc_types: "type[Exception] | tuple[type[Exception], ...]" = Exception,
+        batch: int = 256,
+    ) -> "MapCatching[Result[U, Exception]]":
+        return MapCatching(op, exc_types, batch, self)
+
     def for_each(self, op: Callable[[Item], None]) -> None:
         while (item := self.next()).is_some():
             op(item.unwrap())
@@ -161,132 +746,1286 @@ class Iterable(Generic[T], ABC):
     def filter_map(self, filter_map: Callable[[T], "Option[U]"]) -> "FilterMap[U]":
         return FilterMap(filter_map, self)
 
+    def filter_map_cached(
+        self,
+        filter_map: "Callable[[T], Option[U]] | OptionMemo[T, Option[U]]",
+        maxsize: "int | None" = 128,
+        ttl: "float | None" = None,
+        key: "Callable[[T], K] | None" = None,
+    ) -> "FilterMap[U]":
+        if not isinstance(filter_map, OptionMemo):
+            filter_map = OptionMemo(filter_map, maxsize, ttl, key)
+        return FilterMap(filter_map, self)
+
+    def flatten_options(self: "Iterable[Option[T]]") -> "NativeIterable[T]":
+        return NativeIterable(opt._inner for opt in self._native() if opt._is_some)
+
+    def oks(self: "Iterable[Result[T, E]]") -> "NativeIterable[T]":
+        return NativeIterable(res._value for res in self._native() if res._is_ok)
+
+    def errs(self: "Iterable[Result[T, E]]") -> "NativeIterable[E]":
+        return NativeIterable(res._value for res in self._native() if not res._is_ok)
+
     def enumerate(self) -> "Enumerate[(int, Item)]":
         return Enumerate(self)
 
     def peekable(self) -> "Peekable[Item]":
         return Peekable(self)
 
-    def skip_while(self, predicate: Callable[[Item], bool]) -> "SkipWhile[Item]":
-        return SkipWhile(predicate, self)
+    def skip_while(self, predicate: Callable[[Item], bool]) -> "SkipWhile[Item]":
+        return SkipWhile(predicate, self)
+
+    def take_while(self, predicate: Callable[[Item], bool]) -> "TakeWhile[Item]":
+        return TakeWhile(predicate, self)
+
+    def map_while(self, predicate: Callable[[T], "Option[U]"]) -> "MapWhile[U]":
+        return MapWhile(predicate, self)
+
+    def skip(self, n: int) -> "Skip[Item]":
+        return Skip(n, self)
+
+    def take(self, n: int) -> "Take[Item]":
+        return Take(n, self)
+
+    # curse python's nonexplicit mutability
+    def scan(self, initial_state: StV, op: Callable[[St, T], "Option[U]"]) -> "Scan[U]":
+        return Scan(initial_state, op, self)
+
+    def scan_fn(self, init: U, op: Callable[[U, T], U]) -> "ScanFn[U]":
+        return ScanFn(init, op, self)
+
+    def flat_map(self, op: Callable[[T], U]) -> "FlatMap[U]":
+        return FlatMap(op, self)
+
+    def flatten(self) -> "Flatten[Item]":
+        return Flatten(self)
+
+    def fuse(self) -> "Fuse[Item]":
+        return Fuse(self)
+
+    def inspect(self, op: Callable[[Item], None]) -> "Inspect[Item]":
+        return Inspect(op, self)
+
+    def collect(self, into: "FromIterable[C]") -> C:
+        into.extend(self._native())
+        return into.finish()
+
+    def partition(
+        self,
+        predicate: Callable[[Item], bool],
+        a: "FromIterable[C]",
+        b: "FromIterable[C]",
+    ) -> ("FromIterable[C]", "FromIterable[C]"):
+        for item in self:
+            if predicate(item):
+                a.add(item)
+            else:
+                b.add(item)
+
+        return a.finish(), b.finish()
+
+    def partition_n(
+        self,
+        key: Callable[[Item], K],
+        collectors: "Sequence[FromIterable] | MutableMapping[K, FromIterable]",
+    ) -> "tuple[C, ...] | dict[K, C]":
+        if isinstance(collectors, MutableMapping):
+            adds = {k: collector.add for k, collector in collectors.items()}
+            for item in self._native():
+                if (add := adds.get(k := key(item))) is None:
+                    raise ValueError(f"no collector for key {k!r}")
+                add(item)
+        else:
+            # keyed by position so negative indices don't wrap around
+            adds = {i: collector.add for i, collector in enumerate(collectors)}
+            for item in self._native():
+                if (add := adds.get(k := key(item))) is None:
+                    raise ValueError(f"no collector at index {k!r}")
+                add(item)
+
+        if isinstance(collectors, MutableMapping):
+            return {k: collector.finish() for k, collector in collectors.items()}
+        return tuple(collector.finish() for collector in collectors)
+
+    def shard(
+        self, n: int, key: Callable[[Item], int] = hash
+    ) -> "tuple[Shard[Item], ...]":
+        source = _ShardSource(n, key, self._native())
+        return tuple(Shard(i, source) for i in range(n))
+
+    def broadcast(self, *collectors: "FromIterable[C, Item]") -> "tuple[C, ...]":
+        adds = [collector.add for collector in collectors]
+        for item in self._native():
+            for add in adds:
+                add(item)
+
+        return tuple(collector.finish() for collector in collectors)
+
+    def aggregate(self, **reducers: "FromIterable[C, Item]") -> "dict[str, C]":
+        return dict(zip(reducers, self.broadcast(*reducers.values())))
+
+    def fold(self, init: U, op: Callable[[U, Item], U]) -> U:
+        return functools.reduce(op, self._native(), init)
+
+    def reduce(self, op: Callable[[Item, Item], Item]) -> "Option[Item]":
+        if (a := self.next()).is_some():
+            return functools.reduce(op, self._native(), a.unwrap())
+        return a
+
+    def min(self) -> "Option[Item]":
+        return self.min_by_key(None)
+
+    def max(self) -> "Option[Item]":
+        return self.max_by_key(None)
+
+    def min_by_key(self, key: "Callable[[Item], K] | None") -> "Option[Item]":
+        from kataria.option import Option
+
+        missing = object()
+        if (res := min(self._native(), key=key, default=missing)) is missing:
+            return Option.Nothing()
+        return Option.Something(res)
+
+    def max_by_key(self, key: "Callable[[Item], K] | None") -> "Option[Item]":
+        from kataria.option import Option
+
+        missing = object()
+        if (res := max(self._native(), key=key, default=missing)) is missing:
+            return Option.Nothing()
+        return Option.Something(res)
+
+    def sum(self, start: Item = 0) -> Item:
+        return sum(self._native(), start)
+
+    def product(self, start: Item = 1) -> Item:
+        return math.prod(self._native(), start=start)
+
+    def sorted(
+        self, key: "Callable[[Item], K] | None" = None, reverse: bool = False
+    ) -> "NativeIterable[Item]":
+        return NativeIterable(sorted(self._native(), key=key, reverse=reverse))
+
+    def external_sort(
+        self,
+        key: "Callable[[Item], K] | None" = None,
+        memory_limit: int = 256 * 1024 * 1024,
+        tmpdir: "str | None" = None,
+    ) -> "ExternalSort[Item]":
+        return ExternalSort(key, memory_limit, tmpdir, self)
+
+    def reservoir_sample(
+        self, k: int, seed: "int | None" = None
+    ) -> "NativeIterable[Item]":
+        # algorithm L: jumps straight to the next replaced item instead of
+        # drawing a random number per item
+        if k < 0:
+            raise ValueError("sample size can't be negative")
+        rng = random.Random(seed)
+
+        def unit() -> float:
+            while (u := rng.random()) == 0.0:
+                pass
+            return u
+
+        reservoir = []
+        while len(reservoir) < k and (item := self.next()).is_some():
+            reservoir.append(item.unwrap())
+        if len(reservoir) < k or k == 0:
+            return NativeIterable(reservoir)
+
+        w = math.exp(math.log(unit()) / k)
+        while True:
+            gap = math.floor(math.log(unit()) / math.log1p(-w))
+            if self.advance_by(gap).is_err() or (item := self.next()).is_none():
+                return NativeIterable(reservoir)
+            reservoir[rng.randrange(k)] = item.unwrap()
+            w *= math.exp(math.log(unit()) / k)
+
+    def k_smallest(
+        self, k: int, key: "Callable[[Item], K] | None" = None
+    ) -> "NativeIterable[Item]":
+        return NativeIterable(heapq.nsmallest(k, self._native(), key=key))
+
+    def k_largest(
+        self, k: int, key: "Callable[[Item], K] | None" = None
+    ) -> "NativeIterable[Item]":
+        return NativeIterable(heapq.nlargest(k, self._native(), key=key))
+
+    def all(self, predicate: Callable[[Item], bool]) -> bool:
+        return all(self.map(predicate))
+
+    def any(self, predicate: Callable[[Item], bool]) -> bool:
+        return any(self.map(predicate))
+
+    def find(self, predicate: Callable[[Item], bool]) -> "Option[Item]":
+        from kataria.option import Option
+
+        while (item := self.next()).is_some():
+            if predicate(item.unwrap()):
+                return item
+        return Option.Nothing()
+
+    def find_map(self, predicate: Callable[[Item], "Option[U]"]) -> "Option[U]":
+        from kataria.option import Option
+
+        while (item := self.next()).is_some():
+            if (mapped := predicate(item.unwrap())).is_some():
+                return mapped
+
+        return Option.Nothing()
+
+    def position(self, predicate: Callable[[Item], bool]) -> "Option[int]":
+        from kataria.option import Option
+
+        i = 0
+        for item in self:
+            if predicate(item):
+                return Option.Something(i)
+            i += 1
+
+        return Option.Nothing()
+
+    def cycle(self) -> "Cycle[Item]":
+        return Cycle(self)
+
+    def windows(self, n: int) -> "Windows[tuple[Item, ...]]":
+        return Windows(n, self)
+
+    def tumbling(self, n: int) -> "Tumbling[tuple[Item, ...]]":
+        return Tumbling(n, self)
+
+    def time_windows(
+        self, size: float, key: Callable[[Item], float]
+    ) -> "TimeWindows[(float, tuple[Item, ...])]":
+        return TimeWindows(size, key, self)
+
+    def chunk_by(self, key: Callable[[Item], K]) -> "ChunkBy[(K, tuple[Item, ...])]":
+        return ChunkBy(key, self)
+
+    def dedup(self) -> "Dedup[Item]":
+        return Dedup(None, self)
+
+    def dedup_by_key(self, key: Callable[[Item], K]) -> "Dedup[Item]":
+        return Dedup(key, self)
+
+    def group_by(
+        self,
+        key: Callable[[Item], K],
+        into: Callable[[], "FromIterable[C, Item]"] = SequenceFromIterable,
+    ) -> "dict[K, C]":
+        groups = {}
+        for item in self:
+            k = key(item)
+            if (collector := groups.get(k)) is None:
+                collector = groups[k] = into()
+            collector.add(item)
+
+        return {k: collector.finish() for k, collector in groups.items()}
+
+    def cache(
+        self, spill_threshold: "int | None" = None, tmpdir: "str | None" = None
+    ) -> "Cached[Item]":
+        return Cached(_CacheBuffer(self._native(), spill_threshold, tmpdir))
+
+    def persist(
+        self,
+        cache_dir: str,
+        key: "Hashable | None" = None,
+        max_bytes: "int | None" = None,
+    ) -> "Persist[Item]":
+        return Persist(cache_dir, key, max_bytes, self)
+
+    def sample_bernoulli(
+        self, p: float, seed: "int | None" = None
+    ) -> "SampleBernoulli[Item]":
+        return SampleBernoulli(p, seed, self)
+
+    def unique(self, key: "Callable[[Item], K] | None" = None) -> "Unique[Item]":
+        seen = set()
+
+        def add(k) -> bool:
+            n = len(seen)
+            seen.add(k)
+            return len(seen) > n
+
+        return Unique(add, key, self)
+
+    def unique_approx(
+        self,
+        capacity: int,
+        error_rate: float = 0.01,
+        key: "Callable[[Item], K] | None" = None,
+    ) -> "Unique[Item]":
+        return Unique(BloomFilter(capacity, error_rate).add, key, self)
+
+    def count_distinct_approx(
+        self, precision: int = 14, key: "Callable[[Item], K] | None" = None
+    ) -> int:
+        hll = HyperLogLog(precision)
+        items = self._native()
+        for item in items if key is None else map(key, items):
+            hll.add(item)
+        return round(hll.estimate())
+
+    def shared(self, chunk_size: int = 64) -> "Shared[Item]":
+        return Shared(chunk_size, self)
+
+    def tee(self, n: int = 2) -> "tuple[Tee[Item], ...]":
+        return tuple(Tee(branch) for branch in itertools.tee(self, n))
+
+
+class NativeIterable(Iterable[T]):
+    Item = T
+
+    def __init__(self, it):
+        self._inner = iter(it)
+
+    def _native(self) -> "typing.Iterator[Item]":
+        return self._inner
+
+    def next(self) -> "Option[Item]":
+        from kataria.option import Option
+
+        try:
+            item = self._inner.__next__()
+            return Option.Something(item)
+        except StopIteration:
+            return Option.Nothing()
+
+    def advance_by(self, n: int) -> "Result[None, int]":
+        from kataria.result import Result
+
+        # drains in C; the counter only ticks for items islice produced
+        n = max(n, 0)
+        counter = itertools.count()
+        deque(zip(itertools.islice(self._native(), n), counter), maxlen=0)
+        if (steps := next(counter)) < n:
+            return Result.Err(n - steps)
+        return Result.Ok(None)
+
+
+class SequenceIterable(Iterable[T]):
+    Item = T
+
+    def __init__(
+        self, seq: "Sequence[Item]", start: int = 0, stop: "int | None" = None
+    ):
+        self._seq = seq
+        self._pos = start
+        self._stop = len(seq) if stop is None else min(stop, len(seq))
+
+    def next(self) -> "Option[Item]":
+        from kataria.option import Option
+
+        if self._pos >= self._stop:
+            return Option.Nothing()
+        self._pos += 1
+        return Option.Something(self._seq[self._pos - 1])
+
+    def _native(self) -> "typing.Iterator[Item]":
+        positions = range(self._pos, self._stop)
+        self._pos = self._stop
+        return map(self._seq.__getitem__, positions)
+
+    def split_len(self) -> int:
+        return max(self._stop - self._pos, 0)
+
+    def split_at(self, i: int) -> "(SequenceIterable[Item], SequenceIterable[Item])":
+        mid = self._pos + max(0, min(i, self.split_len()))
+        return (
+            SequenceIterable(self._seq, self._pos, mid),
+            SequenceIterable(self._seq, mid, self._stop),
+        )
+
+    def _one_to_one(self) -> bool:
+        return True
+
+
+class RangeIterable(Iterable[int]):
+    Item = int
+
+    # adapters and terminals work on the underlying range arithmetically, so
+    # they cost the same no matter how many items they cover
+
+    def __init__(self, start: int, stop: "int | None" = None, step: int = 1):
+        if stop is None:
+            start, stop = 0, start
+        self._range = range(start, stop, step)
+
+    @classmethod
+    def _from_range(cls, r: range) -> "RangeIterable":
+        return cls(r.start, r.stop, r.step)
+
+    @staticmethod
+    def _len(r: range) -> int:
+        # len() overflows past sys.maxsize
+        if r.step > 0:
+            return max(0, (r.stop - r.start + r.step - 1) // r.step)
+        return max(0, (r.start - r.stop - r.step - 1) // -r.step)
+
+    def _consume(self):
+        self._range = range(self._range.stop, self._range.stop, self._range.step)
+
+    def next(self) -> "Option[int]":
+        from kataria.option import Option
+
+        r = self._range
+        if not r:
+            return Option.Nothing()
+        self._range = range(r.start + r.step, r.stop, r.step)
+        return Option.Something(r.start)
+
+    def _native(self) -> "typing.Iterator[int]":
+        r = self._range
+        self._consume()
+        return iter(r)
+
+    def count(self) -> int:
+        n = self._len(self._range)
+        self._consume()
+        return n
+
+    def last(self) -> "Option[int]":
+        from kataria.option import Option
+
+        r = self._range
+        self._consume()
+        return Option(bool(r), r[-1] if r else None)
+
+    def advance_by(self, n: int) -> "Result[None, int]":
+        from kataria.result import Result
+
+        n = max(n, 0)
+        steps = min(n, self._len(self._range))
+        self._range = self._range[steps:]
+        if steps < n:
+            return Result.Err(n - steps)
+        return Result.Ok(None)
+
+    def nth(self, n: int) -> "Option[int]":
+        self.advance_by(n)
+        return self.next()
+
+    # like every other adapter, these own their source afterwards
+
+    def step_by(self, step: int) -> "RangeIterable":
+        if step < 1:
+            raise ValueError("step has to be positive")
+        r = self._range
+        self._consume()
+        return self._from_range(r[::step])
+
+    def skip(self, n: int) -> "RangeIterable":
+        self._range = self._range[max(n, 0) :]
+        return self
+
+    def take(self, n: int) -> "RangeIterable":
+        r = self._range
+        self._consume()
+        return self._from_range(r[: max(n, 0)])
+
+    def sum(self, start: int = 0) -> int:
+        r = self._range
+        self._consume()
+        if not r:
+            return start
+        return start + self._len(r) * (r[0] + r[-1]) // 2
+
+    def min(self) -> "Option[int]":
+        from kataria.option import Option
+
+        r = self._range
+        self._consume()
+        return Option(bool(r), (r[0] if r.step > 0 else r[-1]) if r else None)
+
+    def max(self) -> "Option[int]":
+        from kataria.option import Option
+
+        r = self._range
+        self._consume()
+        return Option(bool(r), (r[-1] if r.step > 0 else r[0]) if r else None)
+
+    def split_len(self) -> int:
+        return self._len(self._range)
+
+    def split_at(self, i: int) -> "(RangeIterable, RangeIterable)":
+        i = max(i, 0)
+        return self._from_range(self._range[:i]), self._from_range(self._range[i:])
+
+    def _one_to_one(self) -> bool:
+        return True
+
+
+class Repeat(Iterable):
+    Item = T
+
+    def __init__(self, value: Item, n: "int | None" = None):
+        self._value = value
+        self._remaining = n
+
+    def next(self) -> "Option[Item]":
+        from kataria.option import Option
+
+        if self._remaining is not None:
+            if self._remaining <= 0:
+                return Option.Nothing()
+            self._remaining -= 1
+        return Option.Something(self._value)
+
+    def count(self) -> int:
+        if self._remaining is None:
+            raise OverflowError("repeat without a count never ends")
+        n = max(self._remaining, 0)
+        self._remaining = 0
+        return n
+
+    def last(self) -> "Option[Item]":
+        from kataria.option import Option
+
+        if self._remaining is None:
+            raise OverflowError("repeat without a count never ends")
+        return Option(self.count() > 0, self._value)
+
+    def advance_by(self, n: int) -> "Result[None, int]":
+        from kataria.result import Result
+
+        n = max(n, 0)
+        if self._remaining is None:
+            return Result.Ok(None)
+        steps = min(n, max(self._remaining, 0))
+        self._remaining -= steps
+        if steps < n:
+            return Result.Err(n - steps)
+        return Result.Ok(None)
+
+    def nth(self, n: int) -> "Option[Item]":
+        self.advance_by(n)
+        return self.next()
+
+    def skip(self, n: int) -> "Repeat[Item]":
+        self.advance_by(n)
+        return self
+
+    def take(self, n: int) -> "Repeat[Item]":
+        n = max(n, 0)
+        remaining = n if self._remaining is None else min(n, self._remaining)
+        self._remaining = 0
+        return Repeat(self._value, remaining)
+
+    def split_len(self) -> int:
+        if self._remaining is None:
+            raise TypeError("repeat without a count can't be split")
+        return max(self._remaining, 0)
+
+    def split_at(self, i: int) -> "(Repeat[Item], Repeat[Item])":
+        size = self.split_len()
+        i = max(0, min(i, size))
+        return Repeat(self._value, i), Repeat(self._value, size - i)
+
+    def _one_to_one(self) -> bool:
+        return True
+
+
+class Successors(Iterable):
+    Item = T
+
+    def __init__(self, first: "Option[Item]", succ: Callable[[Item], "Option[Item]"]):
+        self._next = first
+        self._succ = succ
+
+    def next(self) -> "Option[Item]":
+        item = self._next
+        if item.is_some():
+            self._next = self._succ(item.unwrap())
+        return item
+
+
+class FromFn(Iterable):
+    Item = T
+
+    def __init__(self, op: Callable[[], "Option[Item]"]):
+        self._op = op
+
+    def next(self) -> "Option[Item]":
+        return self._op()
+
+
+class FileRangeIterable(Iterable):
+    Item = T
+
+    # yields the lines that start inside [start, stop), so adjacent ranges
+    # split at arbitrary byte offsets never share or lose a line
+
+    def __init__(
+        self,
+        path,
+        start: int = 0,
+        stop: "int | None" = None,
+        encoding: "str | None" = None,
+    ):
+        self._f = None
+        self._path = path
+        self._pos = start
+        self._stop = os.path.getsize(path) if stop is None else stop
+        self._encoding = encoding
+
+    def next(self) -> "Option[Item]":
+        from kataria.option import Option
+
+        if self._f is None:
+            if self._pos >= self._stop:
+                return Option.Nothing()
+            self._f = open(self._path, "rb")
+            if self._pos > 0:
+                self._f.seek(self._pos - 1)
+                self._pos += len(self._f.readline()) - 1
+
+        line = self._f.readline() if self._pos < self._stop else b""
+        if not line:
+            self.close()
+            return Option.Nothing()
+
+        self._pos += len(line)
+        if self._encoding is not None:
+            line = line.decode(self._encoding)
+        return Option.Something(line)
+
+    def _identity(self) -> tuple:
+        st = os.stat(self._path)
+        return (
+            "file range",
+            os.path.abspath(self._path),
+            st.st_mtime_ns,
+            st.st_size,
+            self._pos,
+            self._stop,
+            self._encoding,
+        )
+
+    def close(self):
+        # partially read ranges (under take, zip or an abandoned worker) don't
+        # hold on to their descriptor, a closed range yields nothing more
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+        self._stop = self._pos
+
+    def __del__(self):
+        if self._f is not None:
+            self._f.close()
+
+    def split_len(self) -> int:
+        return max(self._stop - self._pos, 0)
+
+    def split_at(self, i: int) -> "(FileRangeIterable, FileRangeIterable)":
+        mid = self._pos + max(0, min(i, self.split_len()))
+        return (
+            FileRangeIterable(self._path, self._pos, mid, self._encoding),
+            FileRangeIterable(self._path, mid, self._stop, self._encoding),
+        )
+
+
+class RestartableIterable(NativeIterable):
+    Item = T
+
+    def __init__(
+        self,
+        factory: Callable[[], "typing.Iterable[Item]"],
+        identity: "Callable[[], Hashable] | None" = None,
+    ):
+        self._factory = factory
+        self._identity = identity
+        super().__init__(factory())
+
+    @classmethod
+    def from_sequence(cls, seq: "typing.Sequence[Item]") -> "RestartableIterable[Item]":
+        return cls(lambda: seq, lambda: ("sequence", pickle.dumps(seq)))
+
+    @classmethod
+    def from_file(cls, path, mode: str = "r") -> "RestartableIterable":
+        def lines():
+            with open(path, mode) as f:
+                yield from f
+
+        def identity():
+            st = os.stat(path)
+            return "file", os.path.abspath(path), mode, st.st_mtime_ns, st.st_size
+
+        return cls(lines, identity)
+
+    def restart(self) -> "RestartableIterable[Item]":
+        return self.__class__(self._factory, self._identity)
+
+
+class Tee(NativeIterable):
+    Item = T
+
+    def clone(self) -> "Tee[Item]":
+        return Tee(self._inner.__copy__())
+
+
+class ChunkBy(NativeIterable):
+    Item = T
+
+    def __init__(self, key: Callable[[T], K], inner: Iterable[T]):
+        super().__init__((k, tuple(g)) for k, g in itertools.groupby(inner, key))
+
+
+class Dedup(NativeIterable):
+    Item = T
+
+    def __init__(self, key: "Callable[[Item], K] | None", inner: Iterable[Item]):
+        super().__init__(next(g) for _, g in itertools.groupby(inner, key))
+
+
+class Merge(NativeIterable):
+    Item = T
+
+    def __init__(
+        self,
+        iterables: "typing.Iterable[Iterable[Item]]",
+        key: "Callable[[Item], K] | None",
+    ):
+        super().__init__(heapq.merge(*iterables, key=key))
+
+
+class MergeJoin(NativeIterable):
+    Item = T
+
+    def __init__(
+        self,
+        a: Iterable[T],
+        b: Iterable[U],
+        a_key: Callable[[T], K],
+        b_key: Callable[[U], K],
+        how: str,
+    ):
+        if how not in ("inner", "left", "outer"):
+            raise ValueError(f"unknown join kind {how!r}")
+        super().__init__(self._join(a, b, a_key, b_key, how))
+
+    @staticmethod
+    def _join(a, b, a_key, b_key, how):
+        from kataria.option import Option
+
+        missing = object()
+
+        def side(v):
+            return Option.Nothing() if v is missing else Option.Something(v)
+
+        def pair(x, y):
+            if how == "inner":
+                return x, y
+            if how == "left":
+                return x, side(y)
+            return side(x), side(y)
+
+        a_groups = itertools.groupby(a, a_key)
+        b_groups = itertools.groupby(b, b_key)
+        a_group = next(a_groups, None)
+        b_group = next(b_groups, None)
+
+        while a_group is not None and b_group is not None:
+            if a_group[0] < b_group[0]:
+                if how != "inner":
+                    for x in a_group[1]:
+                        yield pair(x, missing)
+                a_group = next(a_groups, None)
+            elif b_group[0] < a_group[0]:
+                if how == "outer":
+                    for y in b_group[1]:
+                        yield pair(missing, y)
+                b_group = next(b_groups, None)
+            else:
+                ys = tuple(b_group[1])
+                for x in a_group[1]:
+                    for y in ys:
+                        yield pair(x, y)
+                a_group = next(a_groups, None)
+                b_group = next(b_groups, None)
+
+        if how != "inner":
+            while a_group is not None:
+                for x in a_group[1]:
+                    yield pair(x, missing)
+                a_group = next(a_groups, None)
+        if how == "outer":
+            while b_group is not None:
+                for y in b_group[1]:
+                    yield pair(missing, y)
+                b_group = next(b_groups, None)
+
+
+class ExternalSort(NativeIterable):
+    Item = T
+
+    _BATCH = 1024
+
+    def __init__(
+        self,
+        key: "Callable[[Item], K] | None",
+        memory_limit: int,
+        tmpdir: "str | None",
+        inner: Iterable[Item],
+    ):
+        if memory_limit < 1:
+            raise ValueError("memory limit has to be positive")
+        super().__init__(self._sort(key, memory_limit, tmpdir, inner._native()))
+
+    @classmethod
+    def _spill(cls, run: list, tmpdir: "str | None"):
+        f = tempfile.TemporaryFile(dir=tmpdir)
+        for i in range(0, len(run), cls._BATCH):
+            pickle.dump(run[i : i + cls._BATCH], f, pickle.HIGHEST_PROTOCOL)
+        f.seek(0)
+        return f
+
+    @classmethod
+    def _sort(cls, key, memory_limit, tmpdir, items):
+        runs = []
+        try:
+            run = []
+            size = 0
+            for item in items:
+                run.append(item)
+                # shallow size estimate, good enough to bound the run length
+                size += sys.getsizeof(item, _SIZE_ESTIMATE)
+                if size >= memory_limit:
+                    run.sort(key=key)
+                    runs.append(cls._spill(run, tmpdir))
+                    run = []
+                    size = 0
+
+            run.sort(key=key)
+            if not runs:
+                yield from run
+                return
+
+            yield from heapq.merge(*map(_read_batches, runs), run, key=key)
+        finally:
+            for f in runs:
+                f.close()
+
+
+class HashJoin(NativeIterable):
+    Item = T
+
+    _PARTITIONS = 16
+    _BATCH = 1024
+
+    def __init__(
+        self,
+        left: Iterable[T],
+        right: Iterable[U],
+        left_key: Callable[[T], K],
+        right_key: Callable[[U], K],
+        how: str,
+        build: str,
+        memory_limit: "int | None",
+        tmpdir: "str | None",
+    ):
+        if how not in ("inner", "left", "semi", "anti"):
+            raise ValueError(f"unknown join kind {how!r}")
+        if build not in ("left", "right"):
+            raise ValueError(f"unknown build side {build!r}")
+        self._how = how
+        self._build_left = build == "left"
+        self._memory_limit = memory_limit
+        self._tmpdir = tmpdir
+
+        if self._build_left:
+            self._build_key, self._probe_key = left_key, right_key
+            super().__init__(self._run(left._native(), right._native()))
+        else:
+            self._build_key, self._probe_key = right_key, left_key
+            super().__init__(self._run(right._native(), left._native()))
+
+    def _run(self, build, probe):
+        table = {}
+        size = 0
+        limit = self._memory_limit
+        for item in build:
+            table.setdefault(self._build_key(item), []).append(item)
+            if limit is not None:
+                size += sys.getsizeof(item, _SIZE_ESTIMATE)
+                if size >= limit:
+                    break
+        else:
+            yield from self._probe(table, probe)
+            return
+
+        # grace hash join: the build side didn't fit, so both sides are
+        # hash-partitioned to disk and joined one partition at a time
+        spilled = itertools.chain(itertools.chain.from_iterable(table.values()), build)
+        table = None
+        build_parts = self._partition(spilled, self._build_key)
+        probe_parts = self._partition(probe, self._probe_key)
+        try:
+            for build_part, probe_part in zip(build_parts, probe_parts):
+                table = {}
+                for item in _read_batches(build_part):
+                    table.setdefault(self._build_key(item), []).append(item)
+                yield from self._probe(table, _read_batches(probe_part))
+        finally:
+            for f in build_parts + probe_parts:
+                f.close()
+
+    def _partition(self, items, key) -> list:
+        n = self._PARTITIONS
+        files = [tempfile.TemporaryFile(dir=self._tmpdir) for _ in range(n)]
+        bufs = [[] for _ in range(n)]
+        for item in items:
+            i = hash(key(item)) % n
+            bufs[i].append(item)
+            if len(bufs[i]) >= self._BATCH:
+                pickle.dump(bufs[i], files[i], pickle.HIGHEST_PROTOCOL)
+                bufs[i].clear()
+
+        for buf, f in zip(bufs, files):
+            if buf:
+                pickle.dump(buf, f, pickle.HIGHEST_PROTOCOL)
+            f.seek(0)
+        return files
+
+    def _probe(self, table: dict, probe):
+        from kataria.option import Option
+
+        how = self._how
+        if not self._build_left:
+            for item in probe:
+                matches = table.get(self._probe_key(item))
+                if how == "inner":
+                    if matches:
+                        for other in matches:
+                            yield item, other
+                elif how == "left":
+                    if matches:
+                        for other in matches:
+                            yield item, Option.Something(other)
+                    else:
+                        yield item, Option.Nothing()
+                elif (how == "semi") == bool(matches):
+                    yield item
+            return
+
+        matched = set()
+        for other in probe:
+            k = self._probe_key(other)
+            if (matches := table.get(k)) is None:
+                continue
+            if how == "inner":
+                for item in matches:
+                    yield item, other
+            elif how == "left":
+                for item in matches:
+                    yield item, Option.Something(other)
+            matched.add(k)
+
+        if how == "inner":
+            return
+        for k, items in table.items():
+            if how == "left":
+                if k not in matched:
+                    for item in items:
+                        yield item, Option.Nothing()
+            elif (how == "semi") == (k in matched):
+                yield from items
+
+
+class _CacheBuffer:
+    def __init__(
+        self,
+        source: "typing.Iterator",
+        spill_threshold: "int | None",
+        tmpdir: "str | None",
+    ):
+        if spill_threshold is not None and spill_threshold < 1:
+            raise ValueError("spill threshold has to be positive")
+        self._source = source
+        self._spill_threshold = spill_threshold
+        self._tmpdir = tmpdir
+        self._items = []
+        self._spilled = 0
+        self._offsets = array("q")
+        self._file = None
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._items)
+
+    def __del__(self):
+        if self._file is not None:
+            self._file.close()
+
+    def fill(self, n: "int | None" = None):
+        # pull in bulk, but never more than fits under the spill threshold
+        while n is None or len(self) < n:
+            want = None if n is None else n - len(self)
+            if self._spill_threshold is not None:
+                room = self._spill_threshold - len(self._items)
+                want = room if want is None else min(want, room)
+
+            before = len(self._items)
+            self._items.extend(itertools.islice(self._source, want))
+            got = len(self._items) - before
+
+            if (
+                self._spill_threshold is not None
+                and len(self._items) >= self._spill_threshold
+            ):
+                self._spill()
+            if want is None or got < want:
+                return
+
+    def get(self, i: int, default=None):
+        if i >= len(self):
+            self.fill(i + 1)
+            if i >= len(self):
+                return default
+
+        if i >= self._spilled:
+            return self._items[i - self._spilled]
+        self._file.seek(self._offsets[i])
+        return pickle.load(self._file)
+
+    def _spill(self):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self._tmpdir)
+        f = self._file
+        f.seek(0, 2)
+        for item in self._items:
+            self._offsets.append(f.tell())
+            pickle.dump(item, f, pickle.HIGHEST_PROTOCOL)
+        self._spilled += len(self._items)
+        self._items = []
+
+
+class Cached(Iterable):
+    Item = Iterable.Item
+
+    _MISSING = object()
 
-    def take_while(self, predicate: Callable[[Item], bool]) -> "TakeWhile[Item]":
-        return TakeWhile(predicate, self)
+    def __init__(self, buf: _CacheBuffer, pos: int = 0):
+        self._buf = buf
+        self._pos = pos
 
-    def map_while(self, predicate: Callable[[T], "Option[U]"]) -> "MapWhile[U]":
-        return MapWhile(predicate, self)
+    def next(self) -> "Option[Item]":
+        from kataria.option import Option
 
-    def skip(self, n: int) -> "Skip[Item]":
-        return Skip(n, self)
+        if (item := self._buf.get(self._pos, self._MISSING)) is self._MISSING:
+            return Option.Nothing()
+        self._pos += 1
+        return Option.Something(item)
 
-    def take(self, n: int) -> "Take[Item]":
-        return Take(n, self)
+    def get(self, index: int) -> "Option[Item]":
+        from kataria.option import Option
 
-    # curse python's nonexplicit mutability
-    def scan(self, initial_state: StV, op: Callable[[St, T], "Option[U]"]) -> "Scan[U]":
-        return Scan(initial_state, op, self)
+        if index < 0:
+            raise ValueError("iterators cannot be accessed in reverse")
+        if (item := self._buf.get(index, self._MISSING)) is self._MISSING:
+            return Option.Nothing()
+        return Option.Something(item)
 
-    def flat_map(self, op: Callable[[T], U]) -> "FlatMap[U]":
-        return FlatMap(op, self)
+    def cursor(self) -> "Cached[Item]":
+        return Cached(self._buf)
 
-    def flatten(self) -> "Flatten[Item]":
-        return Flatten(self)
+    def advance_by(self, n: int) -> "Result[None, int]":
+        from kataria.result import Result
 
-    def fuse(self) -> "Fuse[Item]":
-        return Fuse(self)
+        self._buf.fill(self._pos + n)
+        steps = min(n, len(self._buf) - self._pos)
+        self._pos += steps
+        if steps < n:
+            return Result.Err(n - steps)
+        return Result.Ok(None)
 
-    def inspect(self, op: Callable[[Item], None]) -> "Inspect[Item]":
-        return Inspect(op, self)
+    def nth(self, n: int) -> "Option[Item]":
+        self.advance_by(n)
+        return self.next()
 
-    def collect(self, into: "FromIterable[C]") -> C:
-        for item in self:
-            into.add(item)
-        return into.finish()
+    def count(self) -> int:
+        self._buf.fill()
+        n = len(self._buf) - self._pos
+        self._pos += n
+        return n
 
-    def partition(
-        self,
-        predicate: Callable[[Item], bool],
-        a: "FromIterable[C]",
-        b: "FromIterable[C]",
-    ) -> ("FromIterable[C]", "FromIterable[C]"):
-        for item in self:
-            if predicate(item):
-                a.add(item)
-            else:
-                b.add(item)
+    def last(self) -> "Option[Item]":
+        from kataria.option import Option
 
-        return a.finish(), b.finish()
+        self._buf.fill()
+        if self._pos >= len(self._buf):
+            return Option.Nothing()
+        self._pos = len(self._buf)
+        return self.get(self._pos - 1)
 
-    def fold(self, init: U, op: Callable[[U, Item], U]) -> U:
-        res = init
-        for item in self:
-            res = op(res, item)
-        return res
 
-    def reduce(self, op: Callable[[Item, Item], Item]) -> "Option[Item]":
-        if (a := self.next()).is_some():
-            a = a.unwrap()
-            for b in self:
-                a = op(a, b)
-        return a
+class Persist(NativeIterable):
+    Item = T
 
-    def all(self, predicate: Callable[[Item], bool]) -> bool:
-        return all(self.map(predicate))
+    _BATCH = 1024
+    _SUFFIX = ".kataria"
 
-    def any(self, predicate: Callable[[Item], bool]) -> bool:
-        return any(self.map(predicate))
+    def __init__(
+        self,
+        cache_dir: str,
+        key: "Hashable | None",
+        max_bytes: "int | None",
+        inner: Iterable[Item],
+    ):
+        parts = _fingerprint(inner)
+        if parts is None and key is None:
+            raise ValueError("pipeline can't be fingerprinted, pass a key")
+        digest = hashlib.sha256(repr((key, parts)).encode()).hexdigest()
 
-    def find(self, predicate: Callable[[Item], bool]) -> "Option[Item]":
-        from kataria.option import Option
+        path = os.path.join(cache_dir, digest + self._SUFFIX)
+        super().__init__(self._run(path, cache_dir, max_bytes, inner))
 
-        while (item := self.next()).is_some():
-            if predicate(item.unwrap()):
-                return item
-        return Option.Nothing()
+    @classmethod
+    def _run(cls, path, cache_dir, max_bytes, inner):
+        # doesn't hold on to self, so an abandoned write is cleaned up as soon
+        # as the iterator is dropped
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            pass
+        else:
+            with f:
+                os.utime(path)
+                yield from _read_batches(f)
+            return
+
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.NamedTemporaryFile(dir=cache_dir, prefix=".tmp-", delete=False)
+        complete = False
+        try:
+            with tmp:
+                batch = []
+                for item in inner._native():
+                    batch.append(item)
+                    if len(batch) >= cls._BATCH:
+                        pickle.dump(batch, tmp, pickle.HIGHEST_PROTOCOL)
+                        batch = []
+                    yield item
+                if batch:
+                    pickle.dump(batch, tmp, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp.name, path)
+            complete = True
+        finally:
+            # a partially consumed pipeline never becomes a cache entry
+            if not complete:
+                os.unlink(tmp.name)
+
+        if max_bytes is not None:
+            cls._evict(cache_dir, max_bytes)
 
-    def find_map(self, predicate: Callable[[Item], "Option[U]"]) -> "Option[U]":
-        from kataria.option import Option
+    @classmethod
+    def _evict(cls, cache_dir, max_bytes):
+        entries = []
+        for entry in os.scandir(cache_dir):
+            if entry.name.endswith(cls._SUFFIX) and not entry.name.startswith("."):
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            os.unlink(path)
+            total -= size
+
+
+class _ShardSource:
+    def __init__(self, n: int, key: Callable[[T], int], source: "typing.Iterator[T]"):
+        if n < 1:
+            raise ValueError("shard count has to be positive")
+        self._n = n
+        self._key = key
+        self._source = source
+        self._bufs = [deque() for _ in range(n)]
+        self._lock = threading.Lock()
+
+    def pull(self, i: int, default):
+        buf = self._bufs[i]
+        with self._lock:
+            while not buf:
+                if (item := next(self._source, default)) is default:
+                    return default
+                self._bufs[self._key(item) % self._n].append(item)
+            return buf.popleft()
+
+
+class Shard(Iterable):
+    Item = Iterable.Item
 
-        while (item := self.next()).is_some():
-            if (mapped := predicate(item.unwrap())).is_some():
-                return mapped
+    _MISSING = object()
 
-        return Option.Nothing()
+    def __init__(self, index: int, source: _ShardSource):
+        self._index = index
+        self._source = source
 
-    def position(self, predicate: Callable[[Item], bool]) -> "Option[int]":
+    def next(self) -> "Option[Item]":
         from kataria.option import Option
 
-        i = 0
-        for item in self:
-            if predicate(item):
-                return Option.Something(i)
-            i += 1
-
-        return Option.Nothing()
+        if (item := self._source.pull(self._index, self._MISSING)) is self._MISSING:
+            return Option.Nothing()
+        return Option.Something(item)
 
-    def cycle(self) -> "Cycle[Item]":
-        return Cycle(self)
+    def buffered(self) -> int:
+        return len(self._source._bufs[self._index])
 
 
-class NativeIterable(Iterable[T]):
+class MapCatching(NativeIterable):
     Item = T
 
-    def __init__(self, it):
-        self._inner = iter(it)
+    def __init__(
+        self,
+        op: Callable[[T], U],
+        exc_types: "type[Exception] | tuple[type[Exception], ...]",
+        batch: int,
+        inner: Iterable[T],
+    ):
+        if batch < 1:
+            raise ValueError("batch size has to be positive")
+        super().__init__(self._run(op, exc_types, batch, inner._native()))
 
-    def next(self) -> "Option[Item]":
-        from kataria.option import Option
+    @staticmethod
+    def _run(op, exc_types, batch, items):
+        from kataria.result import Result
 
-        try:
-            item = self._inner.__next__()
-            return Option.Something(item)
-        except StopIteration:
-            return Option.Nothing()
+        # one try block covers a whole batch. values computed before a
+        # failure are kept, only the rest of that batch is handled per item
+        while block := list(itertools.islice(items, batch)):
+            values = []
+            append = values.append
+            try:
+                for item in block:
+                    append(op(item))
+            except exc_types as e:
+                yield from map(Result.Ok, values)
+                yield Result.Err(e)
+                for item in block[len(values) + 1 :]:
+                    try:
+                        yield Result.Ok(op(item))
+                    except exc_types as e:
+                        yield Result.Err(e)
+            else:
+                yield from map(Result.Ok, values)
+
+
+class ScanFn(NativeIterable):
+    Item = U
+
+    def __init__(self, init: Item, op: Callable[[Item, T], Item], inner: Iterable[T]):
+        # accumulate yields the initial state first, scan doesn't
+        states = itertools.accumulate(inner._native(), op, initial=init)
+        super().__init__(itertools.islice(states, 1, None))
 
 
 class OptionSequenceIterable(NativeIterable):
     Item = T
 
+    def _native(self) -> "typing.Iterator[Item]":
+        return self
+
     def next(self) -> "Option[Item]":
         from kataria.option import Option
 
@@ -316,15 +2055,25 @@ class StepBy(Iterable):
 class Chain(Iterable):
     Item = Iterable.Item
 
-    def __init__(self, a: Iterable[Item], b: Iterable[Item]):
-        self._a = a
-        self._b = b
+    def __init__(self, *sources: Iterable[Item]):
+        # nested chains are spliced in so that per-item cost doesn't grow
+        # with the number of chained sources
+        self._sources = deque()
+        for source in sources:
+            if isinstance(source, Chain):
+                self._sources.extend(source._sources)
+            else:
+                self._sources.append(source)
 
     def next(self) -> "Option[Item]":
-        a_item = self._a.next()
-        if a_item.is_some():
-            return a_item
-        return self._b.next()
+        from kataria.option import Option
+
+        sources = self._sources
+        while sources:
+            if (item := sources[0].next()).is_some():
+                return item
+            sources.popleft()
+        return Option.Nothing()
 
 
 class Zip(Iterable):
@@ -343,6 +2092,20 @@ class Zip(Iterable):
             return Option.Something((a_item.unwrap(), b_item.unwrap()))
         return Option.Nothing()
 
+    def split_len(self) -> int:
+        return min(self._a.split_len(), self._b.split_len())
+
+    def split_at(self, i: int) -> "(Zip[Item], Zip[Item])":
+        if not self._one_to_one():
+            raise TypeError("zip can only be split over one-to-one pipelines")
+        i = max(0, min(i, self.split_len()))
+        a_left, a_right = self._a.split_at(i)
+        b_left, b_right = self._b.split_at(i)
+        return Zip(a_left, b_left), Zip(a_right, b_right)
+
+    def _one_to_one(self) -> bool:
+        return self._a._one_to_one() and self._b._one_to_one()
+
 
 class Map(Iterable):
     Item = U
@@ -354,6 +2117,19 @@ class Map(Iterable):
     def next(self) -> "Option[Item]":
         return self._i.next().map(self._op)
 
+    def _native(self) -> "typing.Iterator[Item]":
+        return map(self._op, self._i._native())
+
+    def split_len(self) -> int:
+        return self._i.split_len()
+
+    def split_at(self, i: int) -> "(Map[Item], Map[Item])":
+        left, right = self._i.split_at(i)
+        return Map(self._op, left), Map(self._op, right)
+
+    def _one_to_one(self) -> bool:
+        return self._i._one_to_one()
+
 
 class Filter(Iterable):
     Item = Iterable.Item
@@ -370,6 +2146,16 @@ class Filter(Iterable):
                 return item
         return Option.Nothing()
 
+    def _native(self) -> "typing.Iterator[Item]":
+        return filter(self._pred, self._i._native())
+
+    def split_len(self) -> int:
+        return self._i.split_len()
+
+    def split_at(self, i: int) -> "(Filter[Item], Filter[Item])":
+        left, right = self._i.split_at(i)
+        return Filter(self._pred, left), Filter(self._pred, right)
+
 
 class FilterMap(Iterable):
     Item = U
@@ -391,29 +2177,86 @@ class FilterMap(Iterable):
 class Enumerate(Iterable):
     Item = Iterable.Item
 
-    def __init__(self, inner: Iterable[Item]):
+    def __init__(self, inner: Iterable[Item], start: int = 0):
         self._inner = inner
-        self._count = 0
+        self._count = start
 
     def next(self) -> "Option[(int, Item)]":
         self._count += 1
         return self._inner.next().map(lambda i: (self._count - 1, i))
 
+    def split_len(self) -> int:
+        return self._inner.split_len()
+
+    def split_at(self, i: int) -> "(Enumerate[Item], Enumerate[Item])":
+        if not self._inner._one_to_one():
+            raise TypeError("enumerate can only be split over one-to-one pipelines")
+        left, right = self._inner.split_at(i)
+        return (
+            Enumerate(left, self._count),
+            Enumerate(right, self._count + left.split_len()),
+        )
+
+    def _one_to_one(self) -> bool:
+        return self._inner._one_to_one()
+
 
 class Peekable(Iterable):
     Item = Iterable.Item
 
     def __init__(self, inner: Iterable[Item]):
         self._inner = inner
-        self._cache = self._inner.next()
+        self._buf = deque()
+
+    def _fill(self, n: int) -> bool:
+        while len(self._buf) < n:
+            if (item := self._inner.next()).is_none():
+                return False
+            self._buf.append(item.unwrap())
+        return True
 
     def next(self) -> "Option[Item]":
-        out = self._cache
-        self._cache = self._inner.next()
-        return out
+        from kataria.option import Option
+
+        if self._buf:
+            return Option.Something(self._buf.popleft())
+        return self._inner.next()
 
     def peek(self) -> "Option[Item]":
-        return self._cache
+        return self.peek_n(0)
+
+    def peek_n(self, n: int) -> "Option[Item]":
+        from kataria.option import Option
+
+        if n < 0:
+            raise ValueError("iterators cannot be accessed in reverse")
+        if self._fill(n + 1):
+            return Option.Something(self._buf[n])
+        return Option.Nothing()
+
+    def next_if(self, predicate: Callable[[Item], bool]) -> "Option[Item]":
+        from kataria.option import Option
+
+        if self._fill(1) and predicate(self._buf[0]):
+            return Option.Something(self._buf.popleft())
+        return Option.Nothing()
+
+    def next_while(self, predicate: Callable[[Item], bool]) -> "NextWhile[Item]":
+        return NextWhile(predicate, self)
+
+    def buffered(self) -> int:
+        return len(self._buf)
+
+
+class NextWhile(Iterable):
+    Item = Iterable.Item
+
+    def __init__(self, predicate: Callable[[Item], bool], inner: "Peekable[Item]"):
+        self._inner = inner
+        self._pred = predicate
+
+    def next(self) -> "Option[Item]":
+        return self._inner.next_if(self._pred)
 
 
 class SkipWhile(Iterable):
@@ -509,6 +2352,20 @@ class Take(Iterable):
 
         return self._inner.next()
 
+    def split_len(self) -> int:
+        return max(0, min(self._remaining, self._inner.split_len()))
+
+    def split_at(self, i: int) -> "(Take[Item], Take[Item])":
+        if not self._inner._one_to_one():
+            raise TypeError("take can only be split over one-to-one pipelines")
+        size = self.split_len()
+        i = max(0, min(i, size))
+        left, right = self._inner.split_at(i)
+        return Take(i, left), Take(size - i, right)
+
+    def _one_to_one(self) -> bool:
+        return self._inner._one_to_one()
+
 
 class Scan(Iterable):
     Item = U
@@ -609,10 +2466,23 @@ class Cycle(Iterable):
         self._buf = list()
         self._i = 0
         self._looping = False
+        # restartable sources are re-read from the start instead of buffered
+        self._restartable = isinstance(inner, RestartableIterable)
+        self._yielded = False
 
     def next(self) -> "Option[Item]":
         from kataria.option import Option
 
+        if self._restartable:
+            if (item := self._inner.next()).is_some():
+                self._yielded = True
+                return item
+            if not self._yielded:
+                return item
+            self._yielded = False
+            self._inner = self._inner.restart()
+            return self.next()
+
         if self._looping:
             ret = Option.Something(self._buf[self._i])
             self._i = (self._i + 1) % len(self._buf)
@@ -624,3 +2494,196 @@ class Cycle(Iterable):
 
         self._looping = True
         return self.next()
+
+
+class Windows(Iterable):
+    Item = Iterable.Item
+
+    def __init__(self, n: int, inner: Iterable[Item]):
+        if n < 1:
+            raise ValueError("window size has to be positive")
+        self._inner = inner
+        self._window = deque(maxlen=n)
+
+    def next(self) -> "Option[tuple[Item, ...]]":
+        from kataria.option import Option
+
+        window = self._window
+        if len(window) == window.maxlen:
+            if (item := self._inner.next()).is_none():
+                return item
+            window.append(item.unwrap())
+        else:
+            while len(window) < window.maxlen:
+                if (item := self._inner.next()).is_none():
+                    return item
+                window.append(item.unwrap())
+
+        return Option.Something(tuple(window))
+
+
+class Tumbling(Iterable):
+    Item = Iterable.Item
+
+    def __init__(self, n: int, inner: Iterable[Item]):
+        if n < 1:
+            raise ValueError("window size has to be positive")
+        self._inner = inner
+        self._n = n
+
+    def next(self) -> "Option[tuple[Item, ...]]":
+        from kataria.option import Option
+
+        buf = []
+        while len(buf) < self._n and (item := self._inner.next()).is_some():
+            buf.append(item.unwrap())
+
+        if buf:
+            return Option.Something(tuple(buf))
+        return Option.Nothing()
+
+
+class TimeWindows(Iterable):
+    Item = Iterable.Item
+
+    def __init__(
+        self, size: float, key: Callable[[Item], float], inner: Iterable[Item]
+    ):
+        if size <= 0:
+            raise ValueError("window size has to be positive")
+        self._inner = inner
+        self._size = size
+        self._key = key
+        self._start = None
+        self._buf = []
+
+    def next(self) -> "Option[(float, tuple[Item, ...])]":
+        from kataria.option import Option
+
+        # items are expected in timestamp order; late items join the open window
+        while (item := self._inner.next()).is_some():
+            value = item.unwrap()
+            ts = self._key(value)
+            start = ts - ts % self._size
+
+            if self._start is None:
+                self._start = start
+            elif start > self._start:
+                out = (self._start, tuple(self._buf))
+                self._start = start
+                self._buf = [value]
+                return Option.Something(out)
+
+            self._buf.append(value)
+
+        if self._buf:
+            out = (self._start, tuple(self._buf))
+            self._start = None
+            self._buf = []
+            return Option.Something(out)
+        return Option.Nothing()
+
+
+class SampleBernoulli(Iterable):
+    Item = Iterable.Item
+
+    # keeps each item with probability p by skipping geometrically
+    # distributed gaps, so the rng is only consulted once per kept item
+
+    def __init__(self, p: float, seed: "int | None", inner: Iterable[Item]):
+        if not 0 <= p <= 1:
+            raise ValueError("probability has to be between 0 and 1")
+        self._inner = inner
+        self._rng = random.Random(seed)
+        self._log_q = math.log1p(-p) if p < 1 else None
+        self._p = p
+
+    def next(self) -> "Option[Item]":
+        from kataria.option import Option
+
+        if self._p == 0:
+            return Option.Nothing()
+        if self._log_q is not None:
+            while (u := self._rng.random()) == 0.0:
+                pass
+            gap = math.floor(math.log(u) / self._log_q)
+            if self._inner.advance_by(gap).is_err():
+                return Option.Nothing()
+        return self._inner.next()
+
+
+class Unique(Iterable):
+    Item = Iterable.Item
+
+    def __init__(
+        self,
+        add: Callable[[K], bool],
+        key: "Callable[[Item], K] | None",
+        inner: Iterable[Item],
+    ):
+        # add records a key and reports whether it wasn't seen before
+        self._inner = inner
+        self._key = key
+        self._add = add
+
+    def next(self) -> "Option[Item]":
+        from kataria.option import Option
+
+        while (item := self._inner.next()).is_some():
+            value = item.unwrap()
+            if self._add(value if self._key is None else self._key(value)):
+                return item
+        return Option.Nothing()
+
+
+class Shared(Iterable):
+    Item = Iterable.Item
+
+    # every pull goes through one lock. that's needed on free-threaded builds
+    # too, python iterators aren't safe to advance concurrently there either
+
+    def __init__(self, chunk_size: int, inner: Iterable[Item]):
+        if chunk_size < 1:
+            raise ValueError("chunk size has to be positive")
+        self._source = inner._native()
+        self._chunk_size = chunk_size
+        self._lock = threading.Lock()
+
+    def next(self) -> "Option[Item]":
+        from kataria.option import Option
+
+        with self._lock:
+            for item in self._source:
+                return Option.Something(item)
+        return Option.Nothing()
+
+    def chunk(self, n: "int | None" = None) -> "list[Item]":
+        with self._lock:
+            return list(itertools.islice(self._source, n or self._chunk_size))
+
+    def chunks(self, n: "int | None" = None) -> "NativeIterable[list[Item]]":
+        return NativeIterable(iter(lambda: self.chunk(n), []))
+
+    def worker(self, n: "int | None" = None) -> "SharedWorker[Item]":
+        return SharedWorker(n or self._chunk_size, self)
+
+
+class SharedWorker(Iterable):
+    Item = Iterable.Item
+
+    # claims a chunk at a time so that threads only contend once per chunk.
+    # meant to be used by a single thread
+
+    def __init__(self, chunk_size: int, shared: Shared):
+        self._shared = shared
+        self._chunk_size = chunk_size
+        self._buf = deque()
+
+    def next(self) -> "Option[Item]":
+        from kataria.option import Option
+
+        if not self._buf:
+            self._buf.extend(self._shared.chunk(self._chunk_size))
+            if not self._buf:
+                return Option.Nothing()
+        return Option.Something(self._buf.popleft())
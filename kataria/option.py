@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Callable, Generic, TypeVar
 
-from kataria import Iterable
+from kataria import FromIterable, Iterable, SequenceFromIterable
 from kataria.common import Panic
 
 if TYPE_CHECKING:
+    import typing
+
     from kataria.result import Result
 
 T = TypeVar("T")
@@ -13,6 +15,7 @@ U = TypeVar("U")
 E = TypeVar("E")
 F = TypeVar("F")
 R = TypeVar("R")
+C = TypeVar("C")
 
 
 class Option(Generic[T], Iterable[T]):
@@ -49,6 +52,23 @@ class Option(Generic[T], Iterable[T]):
     def Nothing(cls) -> "Option[T]":
         return cls(False, None)
 
+    @classmethod
+    def sequence(
+        cls,
+        options: "typing.Iterable[Option[T]]",
+        into: FromIterable[C, T] | None = None,
+    ) -> "Option[C]":
+        into = SequenceFromIterable() if into is None else into
+        for opt in options:
+            if not opt._is_some:
+                return cls.Nothing()
+            into.add(opt._inner)
+        return cls.Something(into.finish())
+
+    @staticmethod
+    def lazy(thunk: Callable[[], "Option[T]"]) -> "LazyOption[T]":
+        return LazyOption(thunk)
+
     def is_some(self) -> bool:
         return self._is_some
 
@@ -183,3 +203,64 @@ class Option(Generic[T], Iterable[T]):
         if self.is_some():
             return self._inner
         return self
+
+
+class LazyOption(Option[T]):
+    # evaluates thunk on first inspection. map and and_then are deferred
+    # until then as well
+
+    def __init__(self, thunk: Callable[[], Option[T]]):
+        self._thunk = thunk
+
+    @classmethod
+    def Something(cls, value) -> Option[T]:
+        return Option(True, value)
+
+    @classmethod
+    def Nothing(cls) -> Option[T]:
+        return Option(False, None)
+
+    def _force(self):
+        if (thunk := self._thunk) is not None:
+            # only cleared once the thunk returns, one that raises is retried
+            opt = thunk()
+            self._forced_flag = opt._is_some
+            self._forced_value = opt._inner
+            self._thunk = None
+
+    @property
+    def _is_some(self) -> bool:
+        self._force()
+        return self._forced_flag
+
+    @_is_some.setter
+    def _is_some(self, value: bool):
+        self._force()
+        self._forced_flag = value
+
+    @property
+    def _inner(self) -> T:
+        self._force()
+        return self._forced_value
+
+    @_inner.setter
+    def _inner(self, value: T):
+        self._force()
+        self._forced_value = value
+
+    def map(self, op: Callable[[T], U]) -> Option[U]:
+        if (thunk := self._thunk) is None:
+            return super().map(op)
+        self._thunk = lambda: thunk().map(op)
+        return self
+
+    def and_then(self, op: Callable[[T], Option[U]]) -> Option[U]:
+        if self._thunk is None:
+            return super().and_then(op)
+        return LazyOption(lambda: Option(self._is_some, self._inner).and_then(op))
+
+    def replace(self, value: T) -> Option[T]:
+        old = Option(self._is_some, self._inner)
+        self._inner = value
+        self._is_some = True
+        return old
@@ -3,15 +3,18 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Callable, Generic, TypeVar
 
 from kataria.common import Panic
-from kataria.iterable import Iterable
+from kataria.iterable import FromIterable, Iterable, SequenceFromIterable
 
 if TYPE_CHECKING:
+    import typing
+
     from kataria.option import Option
 
 T = TypeVar("T")
 U = TypeVar("U")
 E = TypeVar("E")
 F = TypeVar("F")
+C = TypeVar("C")
 
 
 class Result(Generic[T, E], Iterable[T]):
@@ -46,6 +49,39 @@ class Result(Generic[T, E], Iterable[T]):
     def Err(cls, error: E) -> "Result[T, E]":
         return cls(False, error)
 
+    @classmethod
+    def sequence(
+        cls,
+        results: "typing.Iterable[Result[T, E]]",
+        into: FromIterable[C, T] | None = None,
+    ) -> "Result[C, E]":
+        into = SequenceFromIterable() if into is None else into
+        for res in results:
+            if not res._is_ok:
+                return cls.Err(res._value)
+            into.add(res._value)
+        return cls.Ok(into.finish())
+
+    @staticmethod
+    def partition_results(
+        results: "typing.Iterable[Result[T, E]]",
+        oks: FromIterable[C, T] | None = None,
+        errs: FromIterable[C, E] | None = None,
+    ) -> (C, C):
+        oks = SequenceFromIterable() if oks is None else oks
+        errs = SequenceFromIterable() if errs is None else errs
+        add_ok, add_err = oks.add, errs.add
+        for res in results:
+            if res._is_ok:
+                add_ok(res._value)
+            else:
+                add_err(res._value)
+        return oks.finish(), errs.finish()
+
+    @staticmethod
+    def lazy(thunk: Callable[[], "Result[T, E]"]) -> "LazyResult[T, E]":
+        return LazyResult(thunk)
+
     def is_ok(self) -> bool:
         return self._is_ok
 
@@ -69,10 +105,19 @@ class Result(Generic[T, E], Iterable[T]):
         return Option(self.is_err(), self._value)
 
     def map(self, op: Callable[[T], U]) -> "Result[U, E]":
+        if self.is_ok():
+            self._value = op(self._value)
+        return self
+
+    def try_map(
+        self,
+        op: Callable[[T], U],
+        exc_types: "type[Exception] | tuple[type[Exception], ...]" = Exception,
+    ) -> "Result[U, E | Exception]":
         if self.is_ok():
             try:
                 self._value = op(self._value)
-            except Exception as e:
+            except exc_types as e:
                 return self.Err(e)
         return self
 
@@ -165,3 +210,58 @@ class Result(Generic[T, E], Iterable[T]):
         if self.is_err():
             return self
         return self._value
+
+
+class LazyResult(Result[T, E]):
+    # evaluates thunk on first inspection. map and and_then are deferred
+    # until then as well
+
+    def __init__(self, thunk: Callable[[], Result[T, E]]):
+        self._thunk = thunk
+
+    @classmethod
+    def Ok(cls, value: T) -> Result[T, E]:
+        return Result(True, value)
+
+    @classmethod
+    def Err(cls, error: E) -> Result[T, E]:
+        return Result(False, error)
+
+    def _force(self):
+        if (thunk := self._thunk) is not None:
+            # only cleared once the thunk returns, one that raises is retried
+            res = thunk()
+            self._forced_flag = res._is_ok
+            self._forced_value = res._value
+            self._thunk = None
+
+    @property
+    def _is_ok(self) -> bool:
+        self._force()
+        return self._forced_flag
+
+    @_is_ok.setter
+    def _is_ok(self, value: bool):
+        self._force()
+        self._forced_flag = value
+
+    @property
+    def _value(self) -> T | E:
+        self._force()
+        return self._forced_value
+
+    @_value.setter
+    def _value(self, value: T | E):
+        self._force()
+        self._forced_value = value
+
+    def map(self, op: Callable[[T], U]) -> Result[U, E]:
+        if (thunk := self._thunk) is None:
+            return super().map(op)
+        self._thunk = lambda: thunk().map(op)
+        return self
+
+    def and_then(self, op: Callable[[T], Result[U, E]]) -> Result[U, E]:
+        if self._thunk is None:
+            return super().and_then(op)
+        return LazyResult(lambda: Result(self._is_ok, self._value).and_then(op))
@@ -0,0 +1,76 @@
+import math
+from typing import Hashable
+
+_M64 = (1 << 64) - 1
+
+
+def _mix64(h: int) -> int:
+    # splitmix64 finalizer, spreads python's (often sequential) hashes over
+    # all 64 bits
+    z = (h + 0x9E3779B97F4A7C15) & _M64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _M64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _M64
+    return z ^ (z >> 31)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity < 1:
+            raise ValueError("capacity has to be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error rate has to be between 0 and 1")
+        self._m = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._k = max(1, round(self._m / capacity * math.log(2)))
+        self._bits = bytearray((self._m + 7) // 8)
+
+    def _positions(self, item: Hashable):
+        z = _mix64(hash(item))
+        h1 = z & 0xFFFFFFFF
+        h2 = (z >> 32) | 1
+        for i in range(self._k):
+            yield (h1 + i * h2) % self._m
+
+    def __contains__(self, item: Hashable) -> bool:
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: Hashable) -> bool:
+        bits = self._bits
+        added = False
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not bits[p >> 3] & mask:
+                bits[p >> 3] |= mask
+                added = True
+        return added
+
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision has to be between 4 and 18")
+        self._p = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, item: Hashable):
+        z = _mix64(hash(item))
+        idx = z >> (64 - self._p)
+        rest = (z << self._p) & _M64
+        rank = 64 - rest.bit_length() + 1 if rest else 64 - self._p + 1
+        if rank > self._registers[idx]:
+            self._registers[idx] = rank
+
+    def estimate(self) -> float:
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0**-r for r in self._registers)
+
+        if raw <= 2.5 * m and (zeros := self._registers.count(0)):
+            return m * math.log(m / zeros)
+        return raw
+
+    def nbytes(self) -> int:
+        return len(self._registers)
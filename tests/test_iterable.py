@@ -1,10 +1,45 @@
+import functools
+import mmap
+import operator
+import os
+import random
+
 import pytest
 
-from kataria import NativeIterable, Option, Result, SequenceFromIterable
+from kataria import (
+    ArrayFromIterable,
+    BitsetFromIterable,
+    ColumnarFromIterable,
+    CountFromIterable,
+    FileRangeIterable,
+    FoldFromIterable,
+    InterningFromIterable,
+    Iterable,
+    MappedFromIterable,
+    MaxFromIterable,
+    MeanFromIterable,
+    Memo,
+    MinFromIterable,
+    NativeIterable,
+    Option,
+    RangeIterable,
+    Result,
+    ResultMemo,
+    SequenceFromIterable,
+    SequenceIterable,
+    SetFromIterable,
+    SumFromIterable,
+    VarianceFromIterable,
+)
 from kataria.common import State
-from kataria.iterable import OptionSequenceIterable, StringFromIterable
+from kataria.iterable import (
+    OptionSequenceIterable,
+    RestartableIterable,
+    StringFromIterable,
+)
 
 from .fixtures import call_counted, finite_iter, infinite_iter
+from .utils import CallCounted, assert_not_called
 
 
 def test_count(finite_iter):
@@ -177,6 +212,10 @@ def test_scan():
     assert it.next() == Option.Nothing()
 
 
+def test_state_slots():
+    assert not hasattr(State(1), "__dict__")
+
+
 def test_flat_map():
     words = ["alpha", "beta", "gamma"]
 
@@ -298,3 +337,949 @@ def test_cycle(finite_iter):
     actual = finite_iter.cycle().take(30).collect(SequenceFromIterable())
 
     assert expected == actual
+
+
+def test_chain_all():
+    shards = [NativeIterable(range(i, i + 3)) for i in range(0, 30, 3)]
+    it = Iterable.chain_all(shards)
+
+    assert it.collect(SequenceFromIterable()) == list(range(30))
+    assert it.next() == Option.Nothing()
+
+
+def test_chain_stays_flat(finite_iter):
+    it = finite_iter
+    for i in range(100):
+        it = it.chain(NativeIterable([i]))
+
+    assert len(it._sources) == 101
+    assert it.collect(SequenceFromIterable()) == list(range(10)) + list(range(100))
+
+
+def test_tee(finite_iter):
+    a, b, c = finite_iter.tee(3)
+
+    assert a.take(5).collect(SequenceFromIterable()) == list(range(5))
+    assert b.collect(SequenceFromIterable()) == list(range(10))
+    assert a.collect(SequenceFromIterable()) == list(range(5, 10))
+    assert c.nth(9) == Option.Something(9)
+    assert c.next() == Option.Nothing()
+
+
+def test_tee_clone(finite_iter):
+    (a,) = finite_iter.tee(1)
+    a.advance_by(3)
+    b = a.clone()
+
+    assert a.collect(SequenceFromIterable()) == list(range(3, 10))
+    assert b.collect(SequenceFromIterable()) == list(range(3, 10))
+
+
+def test_cycle_restartable(call_counted):
+    call_counted.f = lambda: range(3)
+    it = RestartableIterable(call_counted).cycle()
+
+    assert it.take(10).collect(SequenceFromIterable()) == [0, 1, 2] * 3 + [0]
+    assert it._buf == []
+    assert call_counted == 4
+
+    assert RestartableIterable.from_sequence([]).cycle().next() == Option.Nothing()
+
+
+def test_restartable_from_file(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_text("a\nb\n")
+    it = RestartableIterable.from_file(path)
+
+    assert it.collect(SequenceFromIterable()) == ["a\n", "b\n"]
+    assert it.restart().map(str.strip).collect(StringFromIterable()) == "ab"
+
+
+def test_peekable_lazy(call_counted):
+    it = NativeIterable(range(10)).inspect(call_counted).peekable()
+    assert call_counted == 0
+    assert it.buffered() == 0
+
+    assert it.peek_n(3) == Option.Something(3)
+    assert call_counted == 4
+    assert it.buffered() == 4
+    assert it.peek_n(10) == Option.Nothing()
+    assert it.buffered() == 10
+
+    assert it.collect(SequenceFromIterable()) == list(range(10))
+
+
+def test_peekable_next_if(finite_iter):
+    it = finite_iter.peekable()
+
+    assert it.next_if(lambda v: v == 0) == Option.Something(0)
+    assert it.next_if(lambda v: v == 0) == Option.Nothing()
+    assert it.next_while(lambda v: v < 4).collect(SequenceFromIterable()) == [1, 2, 3]
+    assert it.next() == Option.Something(4)
+
+
+def test_windows(finite_iter):
+    expected = [(i, i + 1, i + 2) for i in range(8)]
+    actual = finite_iter.windows(3).collect(SequenceFromIterable())
+
+    assert expected == actual
+    assert NativeIterable(range(2)).windows(3).next() == Option.Nothing()
+    with pytest.raises(ValueError):
+        _ = finite_iter.windows(0)
+
+
+def test_tumbling(finite_iter):
+    expected = [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9)]
+    actual = finite_iter.tumbling(4).collect(SequenceFromIterable())
+
+    assert expected == actual
+
+
+def test_time_windows():
+    events = [(0, "a"), (3, "b"), (10, "c"), (31, "d"), (35, "e"), (39.5, "f")]
+
+    expected = [
+        (0, ((0, "a"), (3, "b"))),
+        (10, ((10, "c"),)),
+        (30, ((31, "d"), (35, "e"), (39.5, "f"))),
+    ]
+    actual = (
+        NativeIterable(events)
+        .time_windows(10, key=lambda e: e[0])
+        .collect(SequenceFromIterable())
+    )
+
+    assert expected == actual
+
+
+def test_chunk_by():
+    logs = ["a1", "a2", "b1", "a3", "c1", "c2"]
+
+    expected = [
+        ("a", ("a1", "a2")),
+        ("b", ("b1",)),
+        ("a", ("a3",)),
+        ("c", ("c1", "c2")),
+    ]
+    actual = (
+        NativeIterable(logs).chunk_by(lambda l: l[0]).collect(SequenceFromIterable())
+    )
+
+    assert expected == actual
+
+
+def test_dedup():
+    items = [1, 1, 2, 3, 3, 3, 1, 4, 4]
+
+    assert NativeIterable(items).dedup().collect(SequenceFromIterable()) == [
+        1,
+        2,
+        3,
+        1,
+        4,
+    ]
+    assert NativeIterable(items).dedup_by_key(lambda v: v % 2).collect(
+        SequenceFromIterable()
+    ) == [1, 2, 3, 4]
+
+
+def test_group_by(finite_iter):
+    expected = {0: [0, 3, 6, 9], 1: [1, 4, 7], 2: [2, 5, 8]}
+    actual = finite_iter.group_by(lambda v: v % 3)
+
+    assert expected == actual
+
+    assert NativeIterable("hello world").group_by(str.isalpha, StringFromIterable) == {
+        True: "helloworld",
+        False: " ",
+    }
+
+
+def test_merge():
+    shards = [NativeIterable(range(i, 30, 3)) for i in range(3)]
+
+    assert Iterable.kmerge_by(shards).collect(SequenceFromIterable()) == list(range(30))
+
+    a = NativeIterable([5, 3, 1])
+    b = NativeIterable([6, 4, 2, 0])
+    actual = a.merge([b], key=lambda v: -v).collect(SequenceFromIterable())
+    assert actual == [6, 5, 4, 3, 2, 1, 0]
+
+
+def test_merge_join():
+    def sides():
+        left = NativeIterable([(1, "a"), (2, "b"), (2, "c"), (4, "d")])
+        right = NativeIterable([(0, "w"), (2, "x"), (2, "y"), (4, "z"), (5, "q")])
+        return left, right
+
+    def first(pair):
+        return pair[0]
+
+    left, right = sides()
+    inner = left.merge_join(right, first).map(lambda p: p[0][1] + p[1][1])
+    assert inner.collect(SequenceFromIterable()) == ["bx", "by", "cx", "cy", "dz"]
+
+    left, right = sides()
+    joined = left.merge_join(right, first, how="left").collect(SequenceFromIterable())
+    assert joined[0] == ((1, "a"), Option.Nothing())
+    assert joined[-1] == ((4, "d"), Option.Something((4, "z")))
+
+    left, right = sides()
+    outer = left.merge_join(right, first, how="outer").collect(SequenceFromIterable())
+    assert len(outer) == 8
+    assert outer[0] == (Option.Nothing(), Option.Something((0, "w")))
+    assert outer[-1] == (Option.Nothing(), Option.Something((5, "q")))
+
+    with pytest.raises(ValueError):
+        left.merge_join(right, first, how="cross")
+
+
+def test_min_max(finite_iter):
+    assert NativeIterable([3, 1, 2]).min() == Option.Something(1)
+    assert NativeIterable([3, 1, 2]).map(lambda v: -v).max() == Option.Something(-1)
+    assert NativeIterable([]).min() == Option.Nothing()
+    assert finite_iter.filter(lambda v: v > 20).max() == Option.Nothing()
+
+    words = ["kataria", "is", "a", "snake"]
+    assert NativeIterable(words).min_by_key(len) == Option.Something("a")
+    assert NativeIterable(words).max_by_key(len) == Option.Something("kataria")
+
+
+def test_sum_product(finite_iter):
+    assert finite_iter.sum() == 45
+    assert NativeIterable(range(1, 6)).product() == 120
+    assert NativeIterable([]).product() == 1
+    assert NativeIterable([0.5, 0.25]).sum(1) == 1.75
+
+
+def test_sorted(finite_iter):
+    expected = list(range(9, -1, -1))
+    actual = finite_iter.sorted(reverse=True).collect(SequenceFromIterable())
+
+    assert expected == actual
+
+
+def test_k_smallest_largest(infinite_iter):
+    items = infinite_iter.map(lambda v: (v * 7919) % 1000).take(1000)
+    (a, b) = items.tee()
+
+    assert a.k_smallest(3).collect(SequenceFromIterable()) == [0, 1, 2]
+    assert b.k_largest(2, key=lambda v: -v).collect(SequenceFromIterable()) == [0, 1]
+
+
+def test_external_sort(infinite_iter, tmp_path):
+    items = infinite_iter.map(lambda v: ((v * 7919) % 5000, str(v))).take(5000)
+
+    # every few items spill into a run file
+    actual = items.external_sort(
+        key=lambda v: v[0], memory_limit=4096, tmpdir=tmp_path
+    ).collect(SequenceFromIterable())
+
+    assert [v[0] for v in actual] == list(range(5000))
+    assert list(tmp_path.iterdir()) == []
+
+    in_memory = (
+        NativeIterable([3, 1, 2]).external_sort().collect(SequenceFromIterable())
+    )
+    assert in_memory == [1, 2, 3]
+
+
+def test_join():
+    def sides():
+        users = NativeIterable([(1, "ada"), (2, "bob"), (3, "cy")])
+        orders = NativeIterable([(10, 1), (11, 3), (12, 1), (13, 4)])
+        return users, orders
+
+    def user_id(user):
+        return user[0]
+
+    def order_user(order):
+        return order[1]
+
+    for build in ("left", "right"):
+        users, orders = sides()
+        inner = users.join(orders, user_id, order_user, build=build)
+        assert sorted(inner.map(lambda p: (p[0][1], p[1][0]))) == [
+            ("ada", 10),
+            ("ada", 12),
+            ("cy", 11),
+        ]
+
+        users, orders = sides()
+        left = users.join(orders, user_id, order_user, how="left", build=build)
+        assert left.filter(lambda p: p[1].is_none()).map(
+            lambda p: p[0][1]
+        ).last() == Option.Something("bob")
+
+        users, orders = sides()
+        semi = users.join(orders, user_id, order_user, how="semi", build=build)
+        assert sorted(semi) == [(1, "ada"), (3, "cy")]
+
+        users, orders = sides()
+        anti = users.join(orders, user_id, order_user, how="anti", build=build)
+        assert anti.collect(SequenceFromIterable()) == [(2, "bob")]
+
+    with pytest.raises(ValueError):
+        _ = users.join(orders, user_id, how="full")
+
+
+def test_join_grace(tmp_path):
+    left = NativeIterable(range(3000))
+    right = NativeIterable(range(0, 6000, 2)).map(lambda v: (v, str(v)))
+
+    joined = left.join(
+        right,
+        lambda v: v,
+        lambda r: r[0],
+        how="left",
+        memory_limit=1024,
+        tmpdir=tmp_path,
+    ).collect(SequenceFromIterable())
+
+    assert len(joined) == 3000
+    assert sorted(joined)[:2] == [
+        (0, Option.Something((0, "0"))),
+        (1, Option.Nothing()),
+    ]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_map_cached(call_counted):
+    call_counted.f = lambda v: v * 10
+    items = [1, 2, 1, 3, 1, 2, 4]
+
+    actual = (
+        NativeIterable(items).map_cached(call_counted).collect(SequenceFromIterable())
+    )
+    assert actual == [v * 10 for v in items]
+    assert call_counted == 4
+
+    shared = Memo(call_counted, maxsize=2)
+    NativeIterable(items).map_cached(shared).for_each(lambda _: None)
+    NativeIterable([4, 2]).map_cached(shared).for_each(lambda _: None)
+    assert (shared.hits, shared.misses, shared.evictions) == (4, 5, 3)
+    assert len(shared) == 2
+
+
+def test_map_cached_ttl():
+    now = [0.0]
+    memo = Memo(lambda v: v + now[0], ttl=5, clock=lambda: now[0])
+
+    assert NativeIterable([1, 1]).map_cached(memo).sum() == 2
+    now[0] = 10.0
+    assert NativeIterable([1]).map_cached(memo).sum() == 11
+    assert (memo.hits, memo.misses, memo.evictions) == (1, 2, 1)
+
+
+def test_filter_map_cached(call_counted):
+    def halve(v):
+        return Option.Something(v // 2) if v % 2 == 0 else Option.Nothing()
+
+    call_counted.f = halve
+    items = [2, 3, 2, 4, 3, 2]
+
+    actual = (
+        NativeIterable(items)
+        .filter_map_cached(call_counted)
+        .map(lambda v: v * 100)
+        .collect(SequenceFromIterable())
+    )
+    assert actual == [100, 100, 200, 100]
+    assert call_counted == 3
+
+    memo = ResultMemo(lambda v: Result.Ok(v).map(lambda x: x + 1))
+    assert Result.Ok(1).and_then(memo).map(lambda x: x * 2) == Result.Ok(4)
+    assert Result.Ok(1).and_then(memo) == Result.Ok(2)
+
+
+def test_cache(call_counted):
+    it = NativeIterable(range(10)).inspect(call_counted).cache()
+    other = it.cursor()
+
+    assert it.take(3).collect(SequenceFromIterable()) == [0, 1, 2]
+    assert call_counted == 3
+    assert other.collect(SequenceFromIterable()) == list(range(10))
+    assert call_counted == 10
+
+    assert it.next() == Option.Something(3)
+    assert it.nth(2) == Option.Something(6)
+    assert it.get(1) == Option.Something(1)
+    assert it.get(10) == Option.Nothing()
+    assert it.count() == 3
+    assert it.cursor().last() == Option.Something(9)
+    assert it.cursor().advance_by(12) == Result.Err(2)
+    assert call_counted == 10
+
+
+def test_cache_spill(tmp_path):
+    it = NativeIterable(range(100)).map(str).cache(spill_threshold=8, tmpdir=tmp_path)
+
+    assert it.nth(50) == Option.Something("50")
+    assert it._buf._spilled >= 48
+    assert it.get(3) == Option.Something("3")
+    assert it.cursor().collect(SequenceFromIterable()) == [str(v) for v in range(100)]
+    assert it.collect(SequenceFromIterable()) == [str(v) for v in range(51, 100)]
+    assert it.cursor().count() == 100
+    assert len(it._buf._items) < 8
+
+
+def test_persist(tmp_path):
+    source = tmp_path / "input.txt"
+    source.write_text("a\nb\nc\n")
+    cache_dir = tmp_path / "cache"
+    # calls are logged to a file, a counter in a closure or global would be
+    # part of the fingerprint and change it on every call
+    log = str(tmp_path / "calls.log")
+
+    def pipeline():
+        def upper(v):
+            with open(log, "a") as f:
+                f.write(".")
+            return v.upper()
+
+        return (
+            RestartableIterable.from_file(source)
+            .map(upper)
+            .filter(lambda v: v != "B\n")
+            .persist(cache_dir)
+        )
+
+    def calls():
+        return os.path.getsize(log)
+
+    assert pipeline().collect(SequenceFromIterable()) == ["A\n", "C\n"]
+    assert calls() == 3
+    assert len(list(cache_dir.iterdir())) == 1
+
+    assert pipeline().collect(SequenceFromIterable()) == ["A\n", "C\n"]
+    assert calls() == 3
+
+    source.write_text("a\nb\nc\nd\n")
+    assert pipeline().collect(SequenceFromIterable()) == ["A\n", "C\n", "D\n"]
+    assert calls() == 7
+
+    # partial consumption doesn't produce an entry
+    source.write_text("e\nf\n")
+    assert pipeline().take(1).count() == 1
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_persist_file_range(tmp_path):
+    path = tmp_path / "input.txt"
+    cache_dir = tmp_path / "cache"
+
+    def run():
+        return (
+            FileRangeIterable(path).persist(cache_dir).collect(SequenceFromIterable())
+        )
+
+    path.write_text("aaa\nbbb\n")
+    assert run() == [b"aaa\n", b"bbb\n"]
+
+    # same size, only the modification time tells them apart
+    mtime = path.stat().st_mtime_ns
+    path.write_text("zzz\nyyy\n")
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+    assert run() == [b"zzz\n", b"yyy\n"]
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_persist_key(tmp_path):
+    with pytest.raises(ValueError):
+        NativeIterable(range(3)).persist(tmp_path)
+
+    first = NativeIterable(range(1000)).persist(tmp_path, key="ids", max_bytes=1)
+    assert first.count() == 1000
+    assert list(tmp_path.iterdir()) == []
+
+    second = NativeIterable(range(3)).persist(tmp_path, key="ids")
+    assert second.collect(SequenceFromIterable()) == [0, 1, 2]
+    assert NativeIterable([]).persist(tmp_path, key="ids").count() == 3
+
+
+def test_persist_captured_state(tmp_path, call_counted):
+    def run(op):
+        source = RestartableIterable.from_sequence([1, 2, 3])
+        return source.map(op).persist(tmp_path).collect(SequenceFromIterable())
+
+    for k in (1, 2):
+        assert run(lambda v: v * k) == [k, 2 * k, 3 * k]
+    for k in (3, 4):
+        assert run(lambda v, k=k: v * k) == [k, 2 * k, 3 * k]
+    for k in (5, 6):
+        assert run(functools.partial(operator.mul, k)) == [k, 2 * k, 3 * k]
+
+    # state that can't be described needs an explicit key
+    with pytest.raises(ValueError):
+        run(call_counted)
+
+
+def test_persist_globals(tmp_path):
+    def run(source):
+        namespace = {}
+        exec(source + "\nop = lambda v: norm(v)", namespace)
+        it = RestartableIterable.from_sequence(["a", "b"]).map(namespace["op"])
+        return it.persist(tmp_path).collect(SequenceFromIterable())
+
+    assert run("def norm(v): return v.upper()") == ["A", "B"]
+    assert run("def norm(v): return v * 2") == ["aa", "bb"]
+    capwords = "import string\ndef norm(v): return string.capwords(v)"
+    assert run(capwords) == ["A", "B"]
+
+    # a global that can't be described needs an explicit key
+    with pytest.raises(ValueError):
+        run("class Norm:\n    __call__ = str.title\nnorm = Norm()")
+
+
+def test_broadcast(finite_iter):
+    evens, total, distinct = finite_iter.broadcast(
+        MappedFromIterable(lambda v: v % 2 == 0, SumFromIterable()),
+        SumFromIterable(),
+        MappedFromIterable(lambda v: v % 3, SetFromIterable()),
+    )
+
+    assert evens == 5
+    assert total == 45
+    assert distinct == {0, 1, 2}
+
+
+def test_aggregate():
+    readings = NativeIterable([2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0])
+
+    stats = readings.aggregate(
+        count=CountFromIterable(),
+        total=SumFromIterable(),
+        low=MinFromIterable(),
+        high=MaxFromIterable(),
+        mean=MeanFromIterable(),
+        variance=VarianceFromIterable(),
+        sample_variance=VarianceFromIterable(sample=True),
+        product=FoldFromIterable(1, lambda acc, v: acc * v),
+    )
+
+    assert stats == {
+        "count": 8,
+        "total": 40.0,
+        "low": Option.Something(2.0),
+        "high": Option.Something(9.0),
+        "mean": Option.Something(5.0),
+        "variance": Option.Something(4.0),
+        "sample_variance": Option.Something(32 / 7),
+        "product": 201600.0,
+    }
+
+    empty = NativeIterable([]).aggregate(
+        low=MinFromIterable(), mean=MeanFromIterable(), var=VarianceFromIterable()
+    )
+    assert empty == {
+        "low": Option.Nothing(),
+        "mean": Option.Nothing(),
+        "var": Option.Nothing(),
+    }
+
+
+def test_partition_n(finite_iter):
+    expected = ([0, 3, 6, 9], [1, 4, 7], [2, 5, 8])
+    actual = finite_iter.partition_n(
+        lambda v: v % 3,
+        [SequenceFromIterable(), SequenceFromIterable(), SequenceFromIterable()],
+    )
+
+    assert expected == actual
+
+    tenants = NativeIterable(["a:1", "b:2", "a:3"]).partition_n(
+        lambda r: r[0], {"a": StringFromIterable(), "b": CountFromIterable()}
+    )
+    assert tenants == {"a": "a:1a:3", "b": 1}
+
+    with pytest.raises(ValueError):
+        NativeIterable(["c:1"]).partition_n(lambda r: r[0], {"a": CountFromIterable()})
+
+    for index in (-1, 3):
+        with pytest.raises(ValueError):
+            NativeIterable(range(3)).partition_n(
+                lambda _: index, [SequenceFromIterable() for _ in range(3)]
+            )
+
+
+def test_shard(infinite_iter):
+    a, b, c = infinite_iter.take(10).shard(3, key=lambda v: v)
+
+    assert c.next() == Option.Something(2)
+    assert (a.buffered(), b.buffered()) == (1, 1)
+    assert b.collect(SequenceFromIterable()) == [1, 4, 7]
+    assert a.collect(SequenceFromIterable()) == [0, 3, 6, 9]
+    assert c.collect(SequenceFromIterable()) == [5, 8]
+
+
+def test_shard_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    shards = NativeIterable(range(10000)).shard(4)
+    with ThreadPoolExecutor(4) as pool:
+        sums = list(pool.map(lambda s: s.sum(), shards))
+
+    assert sum(sums) == sum(range(10000))
+    assert sums[1] == sum(range(1, 10000, 4))
+
+
+def test_split_sequence():
+    parts = SequenceIterable(range(10)).split(3)
+
+    assert [p.split_len() for p in parts] == [3, 3, 4]
+    assert [p.collect(SequenceFromIterable()) for p in parts] == [
+        [0, 1, 2],
+        [3, 4, 5],
+        [6, 7, 8, 9],
+    ]
+
+    left, right = SequenceIterable("kataria").split_at(100)
+    assert (left.count(), right.count()) == (7, 0)
+
+
+def test_split_pipeline():
+    def pipeline():
+        letters = SequenceIterable("abcdefghijklmnopqrstuvwxyz")
+        return (
+            SequenceIterable(range(100))
+            .map(lambda v: v * 3)
+            .enumerate()
+            .zip(letters)
+            .take(20)
+            .filter(lambda p: p[0][1] % 2 == 0)
+        )
+
+    expected = pipeline().collect(SequenceFromIterable())
+    parts = pipeline().split(4)
+    actual = Iterable.chain_all(parts).collect(SequenceFromIterable())
+
+    assert expected == actual
+    assert expected[1] == ((2, 6), "c")
+
+    with pytest.raises(TypeError):
+        SequenceIterable(range(10)).filter(bool).take(3).split_at(1)
+    with pytest.raises(TypeError):
+        NativeIterable(range(10)).split(2)
+
+
+def test_split_file_range(tmp_path):
+    path = tmp_path / "records.txt"
+    lines = [f"record {i}{'!' * (i % 7)}\n" for i in range(50)]
+    path.write_text("".join(lines))
+
+    for n in (1, 3, 7, 40):
+        parts = FileRangeIterable(path, encoding="utf-8").split(n)
+        assert Iterable.chain_all(parts).collect(SequenceFromIterable()) == lines
+
+    part = FileRangeIterable(path, encoding="utf-8")
+    assert part.take(2).collect(SequenceFromIterable()) == lines[:2]
+    f = part._f
+    part.close()
+    assert f.closed
+    assert part.next() == Option.Nothing()
+
+    part = FileRangeIterable(path)
+    assert part.advance_by(50) == Result.Ok(None)
+    f = part._f
+    assert part.next() == Option.Nothing()
+    assert f.closed
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        left, right = SequenceIterable(m).split_at(7)
+        assert bytes(left.collect(SequenceFromIterable())) == b"record "
+        assert right.count() == len(m) - 7
+
+
+def test_range_iterable():
+    ids = RangeIterable(0, 10**12).step_by(7).skip(10**9).take(5)
+    assert isinstance(ids, RangeIterable)
+    assert ids.collect(SequenceFromIterable()) == [7 * (10**9 + i) for i in range(5)]
+
+    assert RangeIterable(10**20).count() == 10**20
+    assert RangeIterable(10**20).last() == Option.Something(10**20 - 1)
+    assert RangeIterable(10**20).nth(10**19) == Option.Something(10**19)
+    assert RangeIterable(10).advance_by(12) == Result.Err(2)
+    assert RangeIterable(0).last() == Option.Nothing()
+    # negative counts are no-ops, as for any other source
+    assert NativeIterable(range(10)).advance_by(-3) == Result.Ok(None)
+    assert RangeIterable(10).nth(-1) == Option.Something(0)
+    r = RangeIterable(10)
+    assert r.advance_by(-3) == Result.Ok(None)
+    assert r.next() == Option.Something(0)
+
+    for r in (range(3, 50, 4), range(50, 3, -3), range(0)):
+        it = RangeIterable(r.start, r.stop, r.step)
+        assert it.sum() == sum(r)
+        assert RangeIterable(r.start, r.stop, r.step).min() == NativeIterable(r).min()
+        assert RangeIterable(r.start, r.stop, r.step).max() == NativeIterable(r).max()
+
+    # adapters move the parent along like they do for any other source
+    r = RangeIterable(10)
+    assert r.skip(3) is r
+    assert r.next() == Option.Something(3)
+    assert r.take(2).collect(SequenceFromIterable()) == [4, 5]
+    assert r.next() == Option.Nothing()
+    r = RangeIterable(10)
+    assert r.step_by(4).collect(SequenceFromIterable()) == [0, 4, 8]
+    assert r.next() == Option.Nothing()
+
+    parts = RangeIterable(0, 100, 3).split(3)
+    assert Iterable.chain_all(parts).collect(SequenceFromIterable()) == list(
+        range(0, 100, 3)
+    )
+
+
+def test_repeat():
+    assert Iterable.repeat("x", 10**15).skip(10**14).count() == 9 * 10**14
+    assert Iterable.repeat("x").take(3).collect(StringFromIterable()) == "xxx"
+    assert Iterable.repeat(1, 0).last() == Option.Nothing()
+    r = Iterable.repeat(1, 5)
+    assert r.advance_by(-3) == Result.Ok(None)
+    assert r.count() == 5
+    r = Iterable.repeat(1, 5)
+    assert r.take(2).count() == 2
+    assert r.next() == Option.Nothing()
+    with pytest.raises(OverflowError):
+        Iterable.repeat(1).count()
+
+
+def test_successors_from_fn():
+    def halve(v):
+        return Option.Something(v // 2) if v > 1 else Option.Nothing()
+
+    powers = Iterable.successors(Option.Something(64), halve)
+    assert powers.collect(SequenceFromIterable()) == [64, 32, 16, 8, 4, 2, 1]
+
+    state = State(0)
+
+    def count_to_three():
+        if state.change(lambda v: v + 1) < 3:
+            return Option.Something(state.get())
+        return Option.Nothing()
+
+    assert Iterable.from_fn(count_to_three).collect(SequenceFromIterable()) == [1, 2, 3]
+
+
+def test_sample_bernoulli(monkeypatch):
+    draws = CallCounted(random.Random.random)
+    monkeypatch.setattr(random.Random, "random", lambda rng: draws(rng))
+
+    sample = RangeIterable(10**9).sample_bernoulli(0.001, seed=42).take(2000)
+    values = sample.collect(SequenceFromIterable())
+
+    assert values == sorted(values)
+    assert 1.8 * 10**6 < values[-1] < 2.2 * 10**6
+    # one draw per kept item, not one per item skipped
+    assert draws == 2000
+
+    def draw(seed):
+        it = NativeIterable(range(10000))
+        return it.sample_bernoulli(0.1, seed=seed).collect(SequenceFromIterable())
+
+    assert draw(7) == draw(7)
+    assert 800 < len(draw(7)) < 1200
+    assert NativeIterable(range(5)).sample_bernoulli(1).count() == 5
+    assert NativeIterable(range(5)).sample_bernoulli(0).count() == 0
+    with pytest.raises(ValueError):
+        NativeIterable(range(5)).sample_bernoulli(1.5)
+
+
+def test_reservoir_sample():
+    sample = RangeIterable(10**9).reservoir_sample(100, seed=1)
+    values = sample.collect(SequenceFromIterable())
+
+    assert len(set(values)) == 100
+    assert max(values) > 9 * 10**8
+    assert RangeIterable(10**9).reservoir_sample(100, seed=1).sum() == sum(values)
+
+    assert NativeIterable(range(3)).reservoir_sample(5).sorted().collect(
+        SequenceFromIterable()
+    ) == [0, 1, 2]
+    with pytest.raises(ValueError):
+        NativeIterable(range(3)).reservoir_sample(-1)
+
+    hits = [0] * 10
+    for seed in range(2000):
+        for v in NativeIterable(range(10)).reservoir_sample(3, seed=seed):
+            hits[v] += 1
+    assert all(500 < h < 700 for h in hits)
+
+
+def test_unique():
+    items = [3, 1, 3, 2, 1, 4, 3]
+
+    assert NativeIterable(items).unique().collect(SequenceFromIterable()) == [
+        3,
+        1,
+        2,
+        4,
+    ]
+    assert (
+        NativeIterable(["a", "B", "A", "b"])
+        .unique(key=str.lower)
+        .collect(StringFromIterable())
+        == "aB"
+    )
+
+
+def test_unique_approx():
+    items = RangeIterable(20000).map(lambda v: v % 5000)
+    kept = items.unique_approx(5000, error_rate=0.01).collect(SequenceFromIterable())
+
+    assert len(kept) == len(set(kept))
+    assert len(kept) > 4900
+
+
+def test_count_distinct_approx():
+    estimate = RangeIterable(200000).map(lambda v: v % 50000).count_distinct_approx()
+    assert abs(estimate - 50000) < 50000 * 0.03
+
+    assert NativeIterable([1, 2, 2, 3]).count_distinct_approx() == 3
+    assert NativeIterable("aAbB").count_distinct_approx(key=str.lower) == 2
+
+
+def test_columnar():
+    schema = {"id": "q", "score": "d", "tenant": "dict", "payload": None}
+    rows = [(i, i / 2, f"tenant-{i % 3}", {"i": i}) for i in range(1000)]
+
+    table = NativeIterable(rows).collect(ColumnarFromIterable(schema))
+
+    assert len(table) == 1000
+    assert table.names() == ["id", "score", "tenant", "payload"]
+    assert table.column("id").sum() == sum(range(1000))
+    assert table.column("tenant").unique().count() == 3
+    assert len(table._dictionaries["tenant"]) == 3
+    assert table.rows().collect(SequenceFromIterable()) == rows
+
+    records = NativeIterable([{"id": 1, "name": "a"}, {"name": "b", "id": 2}])
+    table = records.collect(ColumnarFromIterable({"id": "b", "name": None}))
+    assert table.rows().collect(SequenceFromIterable()) == [(1, "a"), (2, "b")]
+
+
+def test_columnar_row_length():
+    for rows in ([(1, "a"), (2,)], [(1, "a"), (2, "b", "c")]):
+        collector = ColumnarFromIterable({"x": "q", "y": None})
+        with pytest.raises(ValueError):
+            NativeIterable(rows).collect(collector)
+        # the bad row isn't partially appended
+        assert collector.collection.rows().collect(SequenceFromIterable()) == [(1, "a")]
+
+
+def test_columnar_numpy():
+    numpy = pytest.importorskip("numpy")
+
+    table = NativeIterable([(1, "x"), (2, "y"), (3, "x")]).collect(
+        ColumnarFromIterable({"n": "i", "tag": "dict"})
+    )
+    arrays = table.to_numpy()
+
+    assert arrays["n"].dtype == numpy.intc
+    assert arrays["n"].sum() == 6
+    assert list(arrays["tag"]) == ["x", "y", "x"]
+
+
+def test_array_collect():
+    ids = RangeIterable(100000).map(lambda v: v * 3).collect(ArrayFromIterable("q"))
+
+    assert ids.typecode == "q"
+    assert len(ids) == 100000
+    assert ids[-1] == 299997
+    assert ids.buffer_info()[1] * ids.itemsize == 800000
+
+
+def test_bitset_collect():
+    bits = NativeIterable([5, 0, 63, 5, 1000]).collect(BitsetFromIterable())
+
+    assert len(bits) == 4
+    assert 63 in bits and 1000 in bits and 5 in bits
+    assert 6 not in bits and -1 not in bits and 10**6 not in bits
+    assert list(bits) == [0, 5, 63, 1000]
+    assert bits.nbytes() < 200
+    with pytest.raises(ValueError):
+        NativeIterable([-1]).collect(BitsetFromIterable())
+
+
+def test_interning_collect():
+    def words():
+        return NativeIterable(["".join(["ab", "c"]) for _ in range(3)])
+
+    local = words().collect(InterningFromIterable())
+    assert local == ["abc"] * 3
+    assert local[0] is local[1] is local[2]
+
+    interned = words().collect(InterningFromIterable(SetFromIterable(), local=False))
+    assert interned == {"abc"}
+
+    ids = NativeIterable([tuple([1, 2]), tuple([1, 2])]).collect(
+        InterningFromIterable()
+    )
+    assert ids[0] is ids[1]
+
+
+def test_flatten_options():
+    options = [Option.Something(1), Option.Nothing(), Option.Something(None)]
+
+    assert NativeIterable(options).flatten_options().collect(
+        SequenceFromIterable()
+    ) == [1, None]
+
+
+def test_oks_errs():
+    def results():
+        return NativeIterable([Result.Ok(1), Result.Err("a"), Result.Ok(2)])
+
+    assert results().oks().sum() == 3
+    assert results().errs().collect(StringFromIterable()) == "a"
+
+
+def test_map_catching(call_counted):
+    call_counted.f = int
+    raw = ["1", "2", "x", "4", "y", "6", "7"]
+
+    results = (
+        NativeIterable(raw)
+        .map_catching(call_counted, ValueError, batch=3)
+        .collect(SequenceFromIterable())
+    )
+
+    assert [r.unwrap_or(None) for r in results] == [1, 2, None, 4, None, 6, 7]
+    assert isinstance(results[2].unwrap_err(), ValueError)
+    assert call_counted == len(raw)
+
+    with pytest.raises(TypeError):
+        NativeIterable([None]).map_catching(int, ValueError).next()
+
+
+def test_scan_fn(finite_iter):
+    expected = [0, 1, 3, 6, 10, 15, 21, 28, 36, 45]
+    actual = finite_iter.scan_fn(0, lambda total, v: total + v).collect(
+        SequenceFromIterable()
+    )
+
+    assert expected == actual
+    assert NativeIterable([]).scan_fn(1, assert_not_called).next() == Option.Nothing()
+
+
+def test_reduce_empty():
+    assert NativeIterable([]).reduce(assert_not_called) == Option.Nothing()
+
+
+def test_shared():
+    from concurrent.futures import ThreadPoolExecutor
+
+    shared = RangeIterable(20000).shared(chunk_size=16)
+
+    def drain(i):
+        if i % 3 == 0:
+            return shared.worker().collect(SequenceFromIterable())
+        if i % 3 == 1:
+            return [v for chunk in shared.chunks(5) for v in chunk]
+        return shared.take(50).collect(SequenceFromIterable())
+
+    with ThreadPoolExecutor(6) as pool:
+        parts = list(pool.map(drain, range(30)))
+
+    seen = [v for part in parts for v in part] + shared.collect(SequenceFromIterable())
+    assert sorted(seen) == list(range(20000))
+    assert shared.next() == Option.Nothing()
+    assert shared.chunk() == []
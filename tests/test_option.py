@@ -1,6 +1,6 @@
 import pytest
 
-from kataria import Option, Panic, Result
+from kataria import Option, Panic, Result, SetFromIterable
 
 from .fixtures import another_thing, call_counted, err, nothing, ok, something
 from .utils import CallCounted, assert_not_called
@@ -190,3 +190,53 @@ def test_flatten(something, nothing):
     nesty = Option.Something(something)
     assert nesty.flatten() == something
     assert nothing.flatten() == nothing
+
+
+def test_sequence(something, another_thing, nothing):
+    assert Option.sequence([something, another_thing]) == Option.Something(["meow", 42])
+    assert Option.sequence([something, nothing]) == nothing
+    assert Option.sequence(iter([]), SetFromIterable()) == Option.Something(set())
+
+
+def test_lazy(call_counted):
+    call_counted.f = lambda: Option.Something(20)
+    opt = Option.lazy(call_counted)
+
+    chained = opt.map(lambda v: v + 1).and_then(lambda v: Option.Something(v * 2))
+    assert call_counted == 0
+
+    assert chained.unwrap() == 42
+    assert opt.is_some()
+    assert opt.unwrap() == 21
+    assert call_counted == 1
+
+    unused = Option.lazy(assert_not_called).map(assert_not_called)
+    assert unused._thunk is not None
+
+    missing = Option.lazy(lambda: Option.Nothing()).map(assert_not_called)
+    assert missing.unwrap_or(7) == 7
+
+    old = Option.lazy(lambda: Option.Something(1)).replace(2)
+    assert old == Option.Something(1)
+
+
+def test_lazy_raising_thunk():
+    attempts = []
+
+    def flaky():
+        attempts.append(None)
+        if len(attempts) == 1:
+            raise ZeroDivisionError
+        return Option.Something(len(attempts))
+
+    opt = Option.lazy(flaky)
+    with pytest.raises(ZeroDivisionError):
+        opt.is_some()
+    assert opt.unwrap() == 2
+    assert opt.unwrap() == 2
+    assert len(attempts) == 2
+
+    broken = Option.lazy(lambda: 1 / 0)
+    for _ in range(2):
+        with pytest.raises(ZeroDivisionError):
+            broken.is_some()
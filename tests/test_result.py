@@ -1,6 +1,13 @@
 import pytest
 
-from kataria import Option, Panic, Result
+from kataria import (
+    CountFromIterable,
+    Option,
+    Panic,
+    Result,
+    SetFromIterable,
+    StringFromIterable,
+)
 
 from .fixtures import call_counted, err, fine, nothing, ok, something
 from .utils import assert_not_called
@@ -76,6 +83,18 @@ def test_map(ok, err):
     assert err.map(assert_not_called) == err
     assert ok.map(lambda v: v * 2).unwrap() == "meowmeow"
 
+    with pytest.raises(ValueError):
+        Result.Ok("meow").map(int)
+
+
+def test_try_map(ok, err):
+    assert err.try_map(assert_not_called) == err
+    assert ok.try_map(lambda v: v * 2).unwrap() == "meowmeow"
+
+    assert isinstance(Result.Ok("meow").try_map(int).unwrap_err(), ValueError)
+    with pytest.raises(ValueError):
+        Result.Ok("meow").try_map(int, KeyError)
+
 
 def test_map_or(ok, err):
     assert ok.map_or(42, lambda v: v * 2) == "meowmeow"
@@ -145,3 +164,65 @@ def test_flatten(ok, err):
     assert nesty.flatten() == ok
     assert nesty2.flatten() == err
     assert err.flatten() == err
+
+
+def test_sequence(ok, fine, err):
+    assert Result.sequence([ok, fine]) == Result.Ok(["meow", "fine"])
+    assert Result.sequence([ok, err, fine]) == err
+    assert Result.sequence([], StringFromIterable()) == Result.Ok("")
+    assert Result.sequence([ok, fine], StringFromIterable()) == Result.Ok("meowfine")
+
+
+def test_partition_results(ok, fine, err):
+    oks, errs = Result.partition_results([ok, err, fine, Result.Err("heck")])
+    assert oks == ["meow", "fine"]
+    assert errs == ["fuck", "heck"]
+
+    oks, errs = Result.partition_results(
+        (Result.Ok(i) if i % 3 else Result.Err(i) for i in range(10)),
+        SetFromIterable(),
+        CountFromIterable(),
+    )
+    assert oks == {1, 2, 4, 5, 7, 8}
+    assert errs == 4
+
+
+def test_lazy(call_counted):
+    call_counted.f = lambda: Result.Ok("10")
+    res = Result.lazy(call_counted)
+
+    chained = res.map(int).and_then(lambda v: Result.Ok(v + 1))
+    assert call_counted == 0
+
+    assert chained == Result.Ok(11)
+    assert res.unwrap() == 10
+    assert call_counted == 1
+
+    failing = Result.lazy(lambda: Result.Ok("nope")).try_map(int)
+    assert failing.is_err()
+    assert isinstance(failing.unwrap_err(), ValueError)
+
+    err = Result.lazy(lambda: Result.Err("fuck")).and_then(assert_not_called)
+    assert err.unwrap_err() == "fuck"
+
+
+def test_lazy_raising_thunk():
+    attempts = []
+
+    def flaky():
+        attempts.append(None)
+        if len(attempts) == 1:
+            raise ZeroDivisionError
+        return Result.Ok(len(attempts))
+
+    res = Result.lazy(flaky)
+    with pytest.raises(ZeroDivisionError):
+        res.is_ok()
+    assert res.unwrap() == 2
+    assert res.unwrap() == 2
+    assert len(attempts) == 2
+
+    broken = Result.lazy(lambda: 1 / 0)
+    for _ in range(2):
+        with pytest.raises(ZeroDivisionError):
+            broken.is_ok()
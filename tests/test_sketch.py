@@ -0,0 +1,37 @@
+import pytest
+
+from kataria import BloomFilter, HyperLogLog
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(1000, 0.01)
+
+    assert bloom.nbytes() < 1500
+    assert bloom.add("kataria")
+    assert not bloom.add("kataria")
+    assert "kataria" in bloom
+    assert "anisodonta" not in bloom
+
+    for i in range(1000):
+        bloom.add(i)
+    false_positives = sum(i in bloom for i in range(1000, 11000))
+    assert false_positives < 200
+
+    with pytest.raises(ValueError):
+        BloomFilter(0)
+    with pytest.raises(ValueError):
+        BloomFilter(10, 1.5)
+
+
+def test_hyperloglog():
+    hll = HyperLogLog(12)
+    assert hll.nbytes() == 4096
+    assert hll.estimate() == 0
+
+    # int keys hash the same on every run, strings depend on PYTHONHASHSEED
+    for i in range(100000):
+        hll.add(i % 20000)
+    assert abs(hll.estimate() - 20000) < 20000 * 0.05
+
+    with pytest.raises(ValueError):
+        HyperLogLog(2)